@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+import secrets
+from dataclasses import dataclass, field
+from typing import Literal
+
+
+StoreBackend = Literal["memory", "sharded"]
+
+STORE_BACKENDS: tuple[StoreBackend, ...] = ("memory", "sharded")
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    store_backend: StoreBackend = "memory"
+    # Synthetic records added on top of the demo seed (tickets and renewals, see MockStore.seed_synthetic).
+    seed_size: int = 0
+    shard_count: int = 4
+    shard_processes: bool = True
+    journal_dir: str | None = None
+    snapshot_every: int = 10_000
+    serve_static: bool = True
+    # Where the renewal document batch writes its offers and contracts.
+    documents_dir: str = "generated_documents"
+    # Polling guard: per-client token bucket and a global cap on in-flight polls.
+    poll_rate: float = 1.0
+    poll_burst: int = 10
+    poll_max_inflight: int = 256
+    # Share one render between identical concurrent polls.
+    coalesce_polls: bool = True
+    # Signs the hb_client cookie. Random per app unless set, so workers that must accept
+    # each other's cookies need the same HOMEBASE_CLIENT_ID_SECRET.
+    client_id_secret: str = field(default_factory=lambda: secrets.token_hex(32), repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.store_backend not in STORE_BACKENDS:
+            raise ValueError(f"Unknown store backend {self.store_backend!r}; expected one of {STORE_BACKENDS}")
+        if self.store_backend == "sharded" and self.journal_dir:
+            raise ValueError("The mutation journal is only supported with the memory backend")
+
+    @classmethod
+    def from_env(cls) -> AppConfig:
+        return cls(
+            store_backend=os.environ.get("HOMEBASE_STORE_BACKEND", "memory"),  # type: ignore[arg-type]
+            seed_size=int(os.environ.get("HOMEBASE_SEED_SIZE", "0")),
+            shard_count=int(os.environ.get("HOMEBASE_SHARDS", "4")),
+            shard_processes=_env_flag("HOMEBASE_SHARD_PROCESSES", True),
+            journal_dir=os.environ.get("HOMEBASE_JOURNAL_DIR") or None,
+            snapshot_every=int(os.environ.get("HOMEBASE_SNAPSHOT_EVERY", "10000")),
+            serve_static=_env_flag("HOMEBASE_SERVE_STATIC", True),
+            documents_dir=os.environ.get("HOMEBASE_DOCUMENTS_DIR") or "generated_documents",
+            poll_rate=float(os.environ.get("HOMEBASE_POLL_RATE", "1.0")),
+            poll_burst=int(os.environ.get("HOMEBASE_POLL_BURST", "10")),
+            poll_max_inflight=int(os.environ.get("HOMEBASE_POLL_MAX_INFLIGHT", "256")),
+            coalesce_polls=_env_flag("HOMEBASE_COALESCE_POLLS", True),
+            client_id_secret=os.environ.get("HOMEBASE_CLIENT_ID_SECRET") or secrets.token_hex(32),
+        )
@@ -1,19 +1,69 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.config import AppConfig
+from app.routes.api import router as api_router
 from app.routes.hx import router as hx_router
 from app.routes.pages import router as pages_router
+from app.services.rate_limit import ClientIdMiddleware
+from app.services.runtime import build_services, get_services
+from app.services.sharding import ShardUnavailable, ShardedStore
+
+
+def create_app(config: AppConfig | None = None) -> FastAPI:
+    config = config or AppConfig.from_env()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        # The store is built and seeded per app at startup, never at import time.
+        services = build_services(config)
+        app.state.services = services
+        app.state.journal = services.journal
+        try:
+            yield
+        finally:
+            services.close()
+
+    app = FastAPI(title="Homebase Hackathon Demo", version="0.1.0", lifespan=lifespan)
+    app.state.config = config
+    app.add_middleware(ClientIdMiddleware, secret=config.client_id_secret)
+    if config.serve_static:
+        app.mount("/static", StaticFiles(directory="app/static"), name="static")
+
+    app.include_router(pages_router)
+    app.include_router(hx_router)
+    app.include_router(api_router)
+
+    @app.exception_handler(ShardUnavailable)
+    async def shard_unavailable(request: Request, exc: ShardUnavailable) -> JSONResponse:
+        return JSONResponse({"detail": str(exc), "shards": exc.shards}, status_code=503)
+
+    @app.get("/health")
+    async def health(request: Request) -> JSONResponse:
+        store = get_services(request).store
+        dead = store.dead_shards() if isinstance(store, ShardedStore) else []
+        if dead:
+            return JSONResponse({"status": "degraded", "dead_shards": dead}, status_code=503)
+        return JSONResponse({"status": "ok"})
 
+    return app
 
-app = FastAPI(title="Homebase Hackathon Demo", version="0.1.0")
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
-app.include_router(pages_router)
-app.include_router(hx_router)
+_default_app: FastAPI | None = None
 
 
-@app.get("/health")
-async def health() -> dict[str, str]:
-    return {"status": "ok"}
+def __getattr__(name: str) -> FastAPI:
+    # Keeps `uvicorn app.main:app` working without building an app on every import;
+    # prefer `uvicorn --factory app.main:create_app`.
+    global _default_app
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _default_app is None:
+        _default_app = create_app()
+    return _default_app
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app.services.intake import IntakeMessage, IntakePipeline
+from app.services.rate_limit import poll_guard
+from app.services.runtime import get_services
+from app.services.sync import ChangeFeed
+
+
+router = APIRouter(prefix="/api", tags=["api"])
+
+
+def _change_feed(request: Request) -> ChangeFeed:
+    feed = get_services(request).change_feed
+    if feed is None:
+        raise HTTPException(status_code=503, detail="Delta sync is not available with the sharded store backend")
+    return feed
+
+
+def _intake(request: Request) -> IntakePipeline:
+    pipeline = get_services(request).intake
+    if pipeline is None:
+        raise HTTPException(status_code=503, detail="Intake is not available with the sharded store backend")
+    return pipeline
+
+
+class WhatsAppMessage(BaseModel):
+    sender: str
+    tenant_name: str
+    unit: str
+    area: str
+    text: str
+
+
+@router.get("/mobile/sync", dependencies=[Depends(poll_guard)])
+async def mobile_sync(
+    since: int = Query(0, ge=0),
+    epoch: str = Query(""),
+    change_feed: ChangeFeed = Depends(_change_feed),
+):
+    # Clients send back both X-Store-Version and X-Store-Epoch; a version from another
+    # epoch is meaningless here and gets a full sync.
+    headers = {"X-Store-Version": str(change_feed.version), "X-Store-Epoch": change_feed.epoch}
+    if change_feed.is_current(since, epoch):
+        return Response(status_code=204, headers=headers)
+    payload = change_feed.delta(since, epoch)
+    return Response(
+        content=json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@router.post("/intake/whatsapp")
+async def whatsapp_intake(messages: list[WhatsAppMessage], intake: IntakePipeline = Depends(_intake)):
+    depth = intake.submit(
+        [
+            IntakeMessage(
+                sender=message.sender,
+                tenant_name=message.tenant_name,
+                unit=message.unit,
+                area=message.area,
+                text=message.text,
+            )
+            for message in messages
+        ]
+    )
+    return JSONResponse({"accepted": len(messages), "queue_depth": depth}, status_code=202)
+
+
+@router.get("/intake/stats")
+async def intake_stats(intake: IntakePipeline = Depends(_intake)):
+    return {**asdict(intake.stats), "queue_depth": len(intake.queue), "lag_ms": round(intake.lag_ms, 1)}
@@ -1,48 +1,90 @@
 from __future__ import annotations
 
+from typing import Any, Callable
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
-from fastapi import APIRouter, Form, Request
+from fastapi import APIRouter, Depends, Form, HTTPException, Request
 from fastapi.responses import HTMLResponse, Response
 from fastapi.templating import Jinja2Templates
 
+from app.services.contract_batch import DocumentBatchRunner
 from app.services.localization import choose_lang, get_pack, normalize_lang
-from app.services.mock_store import store
+from app.services.rate_limit import poll_guard
+from app.services.runtime import get_services
 
 
 templates = Jinja2Templates(directory="app/templates")
 router = APIRouter(prefix="/hx", tags=["htmx"])
 
+MOBILE_TABS = {
+    "tickets": {
+        "title": "Active Tickets",
+        "lines": ["M-1247 AC Repair - In Progress", "M-1289 Plumbing Leak - Assigned"],
+    },
+    "renewals": {
+        "title": "Renewal Queue",
+        "lines": ["Unit 402 - 62 days - Offer pending", "Unit 111 - 14 days - Critical follow-up"],
+    },
+    "ai": {
+        "title": "AI Actions",
+        "lines": ["Checking RERA index", "Drafting bilingual renewal offer"],
+    },
+}
+
 
 def _lang_from_request(request: Request) -> str:
     return choose_lang(request.query_params.get("lang"), request.cookies.get("lang"))
 
 
-@router.get("/agent/status")
+async def _coalesced_partial(
+    request: Request,
+    lang: str,
+    template_name: str,
+    build_context: Callable[[], dict[str, Any]],
+) -> HTMLResponse:
+    # Identical polls (same path, query and resolved lang) share one store call and render.
+    # Only for read-only partials: a poll that changes state must run once per request.
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())), lang)
+
+    async def compute() -> str:
+        context = await get_services(request).call(build_context)
+        context["lang"] = lang
+        # These partials render in well under a millisecond; a thread-pool hop costs more.
+        return templates.get_template(template_name).render(context)
+
+    return HTMLResponse(await get_services(request).single_flight.do(key, compute))
+
+
+@router.get("/agent/status", dependencies=[Depends(poll_guard)])
 async def agent_status(request: Request):
     lang = _lang_from_request(request)
-    labels = get_pack(lang).labels
-    return templates.TemplateResponse(
+    return await _coalesced_partial(
+        request,
+        lang,
         "partials/agent_status_chip.html",
-        {
-            "request": request,
-            "agent_state": store.get_agent_state(),
-            "labels": labels,
-            "lang": lang,
-        },
+        lambda: {"agent_state": get_services(request).store.get_agent_state(), "labels": get_pack(lang).labels},
     )
 
 
-@router.get("/agent/activity-feed")
+@router.get("/agent/activity-feed", dependencies=[Depends(poll_guard)])
 async def activity_feed(request: Request):
     lang = _lang_from_request(request)
-    return templates.TemplateResponse(
+    return await _coalesced_partial(
+        request,
+        lang,
         "partials/activity_feed.html",
-        {
-            "request": request,
-            "items": store.get_activity_slice(limit=3),
-            "lang": lang,
-        },
+        lambda: {"items": get_services(request).store.get_activity_slice(limit=3)},
+    )
+
+
+@router.get("/search")
+async def search(request: Request, q: str = ""):
+    lang = _lang_from_request(request)
+    return await _coalesced_partial(
+        request,
+        lang,
+        "partials/search_results.html",
+        lambda: {"query": q, "results": get_services(request).search(q), "labels": get_pack(lang).labels},
     )
 
 
@@ -53,7 +95,8 @@ async def assign_vendor(
     vendor_id: str = Form(...),
     lang: str = Form("en"),
 ):
-    ticket, vendor = store.assign_vendor(ticket_id=ticket_id, vendor_id=vendor_id)
+    services = get_services(request)
+    ticket, vendor = await services.call(services.store.assign_vendor, ticket_id, vendor_id)
     return templates.TemplateResponse(
         "partials/vendor_assignment_result.html",
         {
@@ -65,17 +108,14 @@ async def assign_vendor(
     )
 
 
-@router.get("/tickets/{ticket_id}/timeline")
+@router.get("/tickets/{ticket_id}/timeline", dependencies=[Depends(poll_guard)])
 async def ticket_timeline(request: Request, ticket_id: str):
-    lang = _lang_from_request(request)
-    ticket = store.advance_ticket(ticket_id)
+    # Not coalesced: every poll advances the demo ticket, so concurrent polls must each run.
+    services = get_services(request)
+    ticket = await services.call(services.store.advance_ticket, ticket_id)
     return templates.TemplateResponse(
         "partials/ticket_timeline.html",
-        {
-            "request": request,
-            "ticket": ticket,
-            "lang": lang,
-        },
+        {"request": request, "ticket": ticket, "lang": _lang_from_request(request)},
     )
 
 
@@ -86,7 +126,8 @@ async def rera_calculate(
     proposed_rent: int = Form(...),
     lang: str = Form("en"),
 ):
-    analysis = store.calculate_rera(unit_id=unit_id, proposed_rent_aed=proposed_rent)
+    services = get_services(request)
+    analysis = await services.call(services.store.calculate_rera, unit_id, proposed_rent)
     return templates.TemplateResponse(
         "partials/rera_result.html",
         {
@@ -101,11 +142,12 @@ async def rera_calculate(
 @router.post("/renewals/bulk-process")
 async def bulk_process(request: Request):
     lang = _lang_from_request(request)
+    services = get_services(request)
     return templates.TemplateResponse(
         "partials/bulk_result_toast.html",
         {
             "request": request,
-            "message": store.bulk_process_renewals(),
+            "message": await services.call(services.store.bulk_process_renewals),
             "kind": "success",
             "lang": lang,
         },
@@ -115,17 +157,57 @@ async def bulk_process(request: Request):
 @router.post("/renewals/send-notices")
 async def send_notices(request: Request):
     lang = _lang_from_request(request)
+    services = get_services(request)
     return templates.TemplateResponse(
         "partials/bulk_result_toast.html",
         {
             "request": request,
-            "message": store.send_notices(),
+            "message": await services.call(services.store.send_notices),
             "kind": "info",
             "lang": lang,
         },
     )
 
 
+def _document_batch_status(request: Request, runner: DocumentBatchRunner, message: str | None = None) -> HTMLResponse:
+    return templates.TemplateResponse(
+        "partials/document_batch_status.html",
+        {
+            "request": request,
+            "running": runner.running,
+            "message": message or runner.message(),
+            "kind": {"failed": "error", "running": "info"}.get(runner.state, "success"),
+            "lang": _lang_from_request(request),
+        },
+    )
+
+
+def _document_runner(request: Request) -> DocumentBatchRunner:
+    runner = get_services(request).documents
+    if runner is None:
+        # Drafting reads contracts and renewals in bulk, so it needs the in-process store.
+        raise HTTPException(
+            status_code=503, detail="Document generation is not available with the sharded store backend"
+        )
+    return runner
+
+
+@router.post("/renewals/generate-documents")
+async def generate_renewal_documents(request: Request):
+    runner = _document_runner(request)
+    if not runner.start(get_services(request).local_store):
+        message = f"A document batch is already running ({runner.renewals} renewals)."
+        return _document_batch_status(request, runner, message)
+    return _document_batch_status(request, runner)
+
+
+# Not behind poll_guard: it reads the runner's in-memory state, and a long batch would
+# otherwise use up the client's poll budget shared with the dashboard partials.
+@router.get("/renewals/documents/status")
+async def document_batch_status(request: Request):
+    return _document_batch_status(request, _document_runner(request))
+
+
 @router.post("/lang/toggle")
 async def lang_toggle(request: Request, lang: str = Form(...)):
     normalized = normalize_lang(lang)
@@ -146,26 +228,10 @@ async def lang_toggle(request: Request, lang: str = Form(...)):
 async def mobile_nav(request: Request, tab: str):
     lang = _lang_from_request(request)
     tab = tab.lower()
-    tabs = {
-        "tickets": {
-            "title": "Active Tickets",
-            "lines": ["M-1247 AC Repair - In Progress", "M-1289 Plumbing Leak - Assigned"],
-        },
-        "renewals": {
-            "title": "Renewal Queue",
-            "lines": ["Unit 402 - 62 days - Offer pending", "Unit 111 - 14 days - Critical follow-up"],
-        },
-        "ai": {
-            "title": "AI Actions",
-            "lines": ["Checking RERA index", "Drafting bilingual renewal offer"],
-        },
-    }
-    payload = tabs.get(tab, tabs["tickets"])
-    return templates.TemplateResponse(
+    payload = MOBILE_TABS.get(tab, MOBILE_TABS["tickets"])
+    return await _coalesced_partial(
+        request,
+        lang,
         "partials/mobile_nav_content.html",
-        {
-            "request": request,
-            "payload": payload,
-            "lang": lang,
-        },
+        lambda: {"payload": payload},
     )
@@ -6,8 +6,9 @@ from fastapi import APIRouter, Request
 from fastapi.responses import RedirectResponse
 from fastapi.templating import Jinja2Templates
 
+from app.services.async_store import store_loader
 from app.services.localization import choose_lang, get_pack
-from app.services.mock_store import store
+from app.services.mock_store import FetchKey
 
 
 templates = Jinja2Templates(directory="app/templates")
@@ -32,9 +33,13 @@ def nav_items(lang: str, labels: dict) -> list[dict[str, str]]:
     ]
 
 
-def base_context(request: Request, title: str, nav_active: str) -> dict:
+async def base_context(request: Request, title: str, nav_active: str, **loads: FetchKey) -> dict:
+    # Page-specific store reads are passed as name=fetch-key and batched with the
+    # layout's own reads into a single store round trip.
     lang = choose_lang(request.query_params.get("lang"), request.cookies.get("lang"))
     pack = get_pack(lang)
+    loads = {"agent_state": ("agent_state",), **loads}
+    values = await store_loader(request).load_many(*loads.values())
     return {
         "request": request,
         "title": title,
@@ -43,8 +48,8 @@ def base_context(request: Request, title: str, nav_active: str) -> dict:
         "labels": pack.labels,
         "nav_items": nav_items(lang, pack.labels),
         "nav_active": nav_active,
-        "agent_state": store.get_agent_state(),
         "today": datetime.now().strftime("%d/%m/%Y"),
+        **dict(zip(loads, values)),
     }
 
 
@@ -56,15 +61,21 @@ async def root(request: Request):
 
 @router.get("/dashboard")
 async def dashboard(request: Request):
-    context = base_context(request, "AI Agent Dashboard", "dashboard")
+    context = await base_context(
+        request,
+        "AI Agent Dashboard",
+        "dashboard",
+        activity_items=("activity", 3),
+        counts=("dashboard_counts",),
+    )
+    counts = context.pop("counts")
     context.update(
         {
-            "activity_items": store.get_activity_slice(limit=3),
-            "active_tickets": len(store.tickets),
-            "pending_renewals": 8,
+            "active_tickets": counts["open_tickets"],
+            "pending_renewals": counts["pending_renewals"],
             "renewal_countdown_days": 62,
-            "actions_today": 47,
-            "response_time": 8,
+            "actions_today": counts["actions_today"],
+            "response_time": context["agent_state"].response_time_seconds,
             "maintenance_pipeline": [
                 "Reported",
                 "Assigned",
@@ -86,7 +97,7 @@ async def dashboard(request: Request):
 
 @router.get("/maintenance/reasoning")
 async def maintenance_reasoning(request: Request):
-    context = base_context(request, "Maintenance Agent Reasoning", "maintenance")
+    context = await base_context(request, "Maintenance Agent Reasoning", "maintenance")
     context.update(
         {
             "steps": [
@@ -104,67 +115,69 @@ async def maintenance_reasoning(request: Request):
 
 @router.get("/maintenance/vendors")
 async def maintenance_vendors(request: Request):
-    context = base_context(request, "Vendor Assignment", "maintenance")
-    context.update(
-        {
-            "vendors": store.get_vendors(),
-            "ticket": store.get_ticket("M-1247"),
-        }
+    context = await base_context(
+        request,
+        "Vendor Assignment",
+        "maintenance",
+        ticket=("ticket", "M-1247"),
+        shortlist=("vendor_shortlist", "M-1247"),
     )
     return templates.TemplateResponse("pages/maintenance_vendors.html", context)
 
 
 @router.get("/maintenance/ticket/{ticket_id}")
 async def maintenance_ticket(request: Request, ticket_id: str):
-    context = base_context(request, f"Ticket {ticket_id}", "maintenance")
-    context.update({"ticket": store.get_ticket(ticket_id)})
+    context = await base_context(request, f"Ticket {ticket_id}", "maintenance", ticket=("ticket", ticket_id))
     return templates.TemplateResponse("pages/maintenance_ticket.html", context)
 
 
 @router.get("/renewals/pipeline")
 async def renewals_pipeline(request: Request):
-    context = base_context(request, "Renewal Pipeline", "renewals")
-    context.update({"buckets": store.get_renewals_by_stage()})
+    context = await base_context(request, "Renewal Pipeline", "renewals", buckets=("renewal_buckets",))
     return templates.TemplateResponse("pages/renewals_pipeline.html", context)
 
 
 @router.get("/renewals/rera/{unit_id}")
 async def renewals_rera(request: Request, unit_id: str):
-    context = base_context(request, "RERA Compliance Engine", "renewals")
-    renewal = store.get_renewal(unit_id)
-    analysis = store.calculate_rera(unit_id, proposed_rent_aed=87000)
-    context.update({"renewal": renewal, "analysis": analysis, "unit_id": unit_id, "proposed_rent": 87000})
+    context = await base_context(
+        request,
+        "RERA Compliance Engine",
+        "renewals",
+        renewal=("renewal", unit_id),
+        analysis=("rera", unit_id, 87000),
+    )
+    context.update({"unit_id": unit_id, "proposed_rent": 87000})
     return templates.TemplateResponse("pages/renewals_rera.html", context)
 
 
 @router.get("/renewals/offer/{unit_id}")
 async def renewals_offer(request: Request, unit_id: str):
-    context = base_context(request, "AI Renewal Offer", "renewals")
-    context.update(
-        {
-            "renewal": store.get_renewal(unit_id),
-            "contract": store.get_contract(unit_id),
-        }
+    context = await base_context(
+        request,
+        "AI Renewal Offer",
+        "renewals",
+        renewal=("renewal", unit_id),
+        contract=("contract", unit_id),
     )
     return templates.TemplateResponse("pages/renewals_offer.html", context)
 
 
 @router.get("/renewals/communication/{tenant_id}")
 async def renewals_communication(request: Request, tenant_id: str):
-    context = base_context(request, "Tenant Renewal Communication", "renewals")
+    context = await base_context(request, "Tenant Renewal Communication", "renewals")
     context.update({"tenant_id": tenant_id})
     return templates.TemplateResponse("pages/renewals_communication.html", context)
 
 
 @router.get("/ai/multi-issue")
 async def multi_issue(request: Request):
-    context = base_context(request, "Multi-Issue Agent Intelligence", "dashboard")
+    context = await base_context(request, "Multi-Issue Agent Intelligence", "dashboard")
     return templates.TemplateResponse("pages/multi_issue.html", context)
 
 
 @router.get("/properties/control-panel")
 async def properties_control_panel(request: Request):
-    context = base_context(request, "Property Manager Control Panel", "properties")
+    context = await base_context(request, "Property Manager Control Panel", "properties")
     units = [
         {
             "unit": f"U-{100 + i}",
@@ -180,43 +193,47 @@ async def properties_control_panel(request: Request):
 
 @router.get("/vendors/compliance")
 async def vendors_compliance(request: Request):
-    context = base_context(request, "Vendor Compliance Tracking", "vendors")
-    context.update({"vendors": store.get_vendors(), "compliance": store.compliance})
+    context = await base_context(
+        request,
+        "Vendor Compliance Tracking",
+        "vendors",
+        vendors=("vendors",),
+        compliance=("compliance",),
+    )
     return templates.TemplateResponse("pages/vendors_compliance.html", context)
 
 
 @router.get("/foundations")
 async def foundations(request: Request):
-    context = base_context(request, "Style Guide & Architecture", "settings")
+    context = await base_context(request, "Style Guide & Architecture", "settings")
     return templates.TemplateResponse("pages/foundations.html", context)
 
 
 @router.get("/mobile/whatsapp")
 async def mobile_whatsapp(request: Request):
-    context = base_context(request, "Mobile WhatsApp Intake", "maintenance")
+    context = await base_context(request, "Mobile WhatsApp Intake", "maintenance")
     return templates.TemplateResponse("pages/mobile_whatsapp.html", context)
 
 
 @router.get("/mobile/dashboard")
 async def mobile_dashboard(request: Request):
-    context = base_context(request, "Mobile Manager Dashboard", "dashboard")
+    context = await base_context(request, "Mobile Manager Dashboard", "dashboard")
     return templates.TemplateResponse("pages/mobile_dashboard.html", context)
 
 
 @router.get("/mobile/ticket/{ticket_id}")
 async def mobile_ticket(request: Request, ticket_id: str):
-    context = base_context(request, "Mobile Ticket Status", "maintenance")
-    context.update({"ticket": store.get_ticket(ticket_id)})
+    context = await base_context(request, "Mobile Ticket Status", "maintenance", ticket=("ticket", ticket_id))
     return templates.TemplateResponse("pages/mobile_ticket.html", context)
 
 
 @router.get("/analytics")
 async def analytics(request: Request):
-    context = base_context(request, "Analytics", "analytics")
-    return templates.TemplateResponse("pages/analytics_placeholder.html", context)
+    context = await base_context(request, "Analytics", "analytics", rollups=("dashboard_counts",))
+    return templates.TemplateResponse("pages/analytics.html", context)
 
 
 @router.get("/settings")
 async def settings(request: Request):
-    context = base_context(request, "Settings", "settings")
+    context = await base_context(request, "Settings", "settings")
     return templates.TemplateResponse("pages/settings_placeholder.html", context)
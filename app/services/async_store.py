@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+
+from app.services.mock_store import FetchKey
+
+
+class BatchBackend(Protocol):
+    def fetch_many(self, keys: list[FetchKey]) -> list[Any]: ...
+
+
+# Per-request DataLoader over fetch_many: every load issued in the same event-loop tick is
+# deduplicated and sent to the backend as one batch, and results are cached for the request.
+@dataclass
+class StoreLoader:
+    backend: BatchBackend
+    offload: bool = False
+    round_trips: int = 0
+    cache: dict[FetchKey, asyncio.Future[Any]] = field(default_factory=dict)
+    _queue: list[FetchKey] = field(default_factory=list)
+
+    def load(self, *key: Any) -> asyncio.Future[Any]:
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self.cache[key] = future
+        if not self._queue:
+            loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+        self._queue.append(key)
+        return future
+
+    async def load_many(self, *keys: FetchKey) -> list[Any]:
+        return list(await asyncio.gather(*(self.load(*key) for key in keys)))
+
+    async def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        self.round_trips += 1
+        try:
+            if self.offload:
+                results = await run_in_threadpool(self.backend.fetch_many, keys)
+            else:
+                results = self.backend.fetch_many(keys)
+        except Exception as exc:
+            for key in keys:
+                self.cache[key].set_exception(exc)
+            return
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                self.cache[key].set_exception(result)
+            else:
+                self.cache[key].set_result(result)
+
+
+def store_loader(request: Request) -> StoreLoader:
+    loader = getattr(request.state, "store_loader", None)
+    if loader is None:
+        # Backends that do real I/O mark themselves blocking and are called off the event loop.
+        services = request.app.state.services
+        loader = StoreLoader(backend=services, offload=getattr(services.store, "blocking", True))
+        request.state.store_loader = loader
+    return loader
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class SingleFlight:
+    enabled: bool = True
+    inflight: dict[Hashable, asyncio.Task[Any]] = field(default_factory=dict)
+    calls: int = 0
+    shared: int = 0
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            self.calls += 1
+            return await compute()
+
+        task = self.inflight.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            self.calls += 1
+            # The work runs as its own task and every caller, the first one included, awaits
+            # it through a shield: a cancelled caller (client disconnect) only stops waiting.
+            task = asyncio.ensure_future(compute())
+            self.inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody is still waiting for doesn't log
+            # "exception never retrieved".
+            task.exception()
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Literal
+
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
+
+from app.services.mock_store import ContractDraft, MockStore, RenewalCase, ReraAnalysis
+
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = "app/templates"
+DOCUMENT_KINDS = ("offer", "contract")
+DOCUMENT_LANGS = ("en", "ar")
+RENEWAL_SEASON_STAGE = "60-90 Days"
+
+
+@dataclass
+class DocumentJob:
+    unit_id: str
+    renewal: RenewalCase
+    contract: ContractDraft
+    # RERA check of the drafted rent; the documents' compliance statement is rendered from it.
+    analysis: ReraAnalysis
+
+    @property
+    def rent_change_aed(self) -> int:
+        return self.contract.rent_aed - self.renewal.current_rent_aed
+
+    @property
+    def rent_change_pct(self) -> float:
+        return round(self.rent_change_aed / self.renewal.current_rent_aed * 100, 1)
+
+
+@dataclass
+class DocumentTiming:
+    unit_id: str
+    kind: str
+    lang: str
+    path: str
+    milliseconds: float
+
+
+@dataclass
+class BatchReport:
+    renewals: int
+    workers: int
+    wall_seconds: float
+    documents: list[DocumentTiming] = field(default_factory=list)
+
+    @property
+    def p50_ms(self) -> float:
+        return statistics.median(doc.milliseconds for doc in self.documents) if self.documents else 0.0
+
+    @property
+    def p95_ms(self) -> float:
+        if not self.documents:
+            return 0.0
+        ordered = sorted(doc.milliseconds for doc in self.documents)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def summary(self) -> str:
+        return (
+            f"Generated {len(self.documents)} documents for {self.renewals} renewals in {self.wall_seconds:.1f}s "
+            f"({self.workers} worker(s); p50 {self.p50_ms:.1f}ms, p95 {self.p95_ms:.1f}ms per document)."
+        )
+
+
+def select_cohort(source: MockStore, stage: str = RENEWAL_SEASON_STAGE) -> list[str]:
+    return [unit_id for unit_id, renewal in source.renewals.items() if renewal.stage == stage]
+
+
+def draft_contract(source: MockStore, unit_id: str) -> ContractDraft:
+    existing = source.contracts.get(unit_id)
+    if existing is not None:
+        return existing
+    started = time.perf_counter()
+    renewal = source.get_renewal(unit_id)
+    expiry = datetime.strptime(renewal.expiry_date, "%d/%m/%Y")
+    start = expiry + timedelta(days=1)
+    try:
+        end = start.replace(year=start.year + 1) - timedelta(days=1)
+    except ValueError:
+        # Term starting on 29 February ends on the last day of the next February.
+        end = start.replace(year=start.year + 1, month=3, day=1) - timedelta(days=1)
+    rent = source.calculate_rera(unit_id, renewal.current_rent_aed).recommended_rent_aed
+    return ContractDraft(
+        contract_id=f"R-{unit_id.removeprefix('U-')}-{start.year}",
+        tenant_name=renewal.tenant_name,
+        unit=renewal.unit,
+        start_date=start.strftime("%d/%m/%Y"),
+        end_date=end.strftime("%d/%m/%Y"),
+        rent_aed=rent,
+        # Whole seconds, rounded up: the field reads "generated in N seconds".
+        generated_seconds=math.ceil(time.perf_counter() - started),
+    )
+
+
+_templates: dict[str, Template] = {}
+
+
+def _load_templates(template_dir: str = TEMPLATE_DIR) -> None:
+    # Runs once per worker process so every job reuses the compiled templates.
+    environment = Environment(loader=FileSystemLoader(template_dir), autoescape=select_autoescape(["html"]))
+    for kind in DOCUMENT_KINDS:
+        _templates[kind] = environment.get_template(f"documents/{kind}.html")
+
+
+def _render_jobs(jobs: list[DocumentJob], output_dir: str) -> list[DocumentTiming]:
+    if not _templates:
+        _load_templates()
+    timings: list[DocumentTiming] = []
+    for job in jobs:
+        for kind in DOCUMENT_KINDS:
+            for lang in DOCUMENT_LANGS:
+                started = time.perf_counter()
+                path = Path(output_dir) / f"{job.contract.contract_id}-{kind}-{lang}.html"
+                path.write_text(
+                    _templates[kind].render(
+                        renewal=job.renewal,
+                        contract=job.contract,
+                        analysis=job.analysis,
+                        change_aed=job.rent_change_aed,
+                        change_pct=job.rent_change_pct,
+                        lang=lang,
+                    ),
+                    encoding="utf-8",
+                )
+                timings.append(
+                    DocumentTiming(
+                        unit_id=job.unit_id,
+                        kind=kind,
+                        lang=lang,
+                        path=str(path),
+                        milliseconds=(time.perf_counter() - started) * 1000,
+                    )
+                )
+    return timings
+
+
+def build_jobs(source: MockStore, unit_ids: list[str]) -> list[DocumentJob]:
+    jobs: list[DocumentJob] = []
+    for unit_id in unit_ids:
+        contract = draft_contract(source, unit_id)
+        jobs.append(
+            DocumentJob(
+                unit_id=unit_id,
+                renewal=source.get_renewal(unit_id),
+                contract=contract,
+                analysis=source.calculate_rera(unit_id, contract.rent_aed),
+            )
+        )
+    return jobs
+
+
+def render_documents(
+    jobs: list[DocumentJob],
+    output_dir: str | Path,
+    workers: int | None = None,
+    chunk_size: int = 100,
+    pool: ProcessPoolExecutor | None = None,
+) -> BatchReport:
+    # With `pool`, chunks go to that long-lived pool instead of one started for this batch.
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    chunks = [jobs[start : start + chunk_size] for start in range(0, len(jobs), chunk_size)]
+    workers = min(workers if workers is not None else os.cpu_count() or 1, len(chunks))
+
+    started = time.perf_counter()
+    documents: list[DocumentTiming] = []
+    if workers <= 1:
+        for chunk in chunks:
+            documents.extend(_render_jobs(chunk, str(output)))
+    elif pool is not None:
+        for timings in pool.map(_render_jobs, chunks, [str(output)] * len(chunks)):
+            documents.extend(timings)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_load_templates) as batch_pool:
+            for timings in batch_pool.map(_render_jobs, chunks, [str(output)] * len(chunks)):
+                documents.extend(timings)
+    return BatchReport(
+        renewals=len(jobs),
+        workers=max(workers, 1),
+        wall_seconds=time.perf_counter() - started,
+        documents=documents,
+    )
+
+
+def generate_documents(
+    source: MockStore,
+    unit_ids: list[str],
+    output_dir: str | Path,
+    workers: int | None = None,
+    chunk_size: int = 100,
+) -> BatchReport:
+    return render_documents(build_jobs(source, unit_ids), output_dir, workers, chunk_size)
+
+
+DocumentRunState = Literal["idle", "running", "done", "failed"]
+
+
+@dataclass
+class DocumentBatchRunner:
+    # One document batch at a time per app, rendered off the event loop. The worker pool
+    # is started on the first run and reused until the app shuts down.
+    output_dir: Path
+    workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    state: DocumentRunState = "idle"
+    renewals: int = 0
+    report: BatchReport | None = None
+    error: str | None = None
+    _task: asyncio.Task[None] | None = field(default=None, repr=False)
+    _pool: ProcessPoolExecutor | None = field(default=None, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return self.state == "running"
+
+    def start(self, source: MockStore) -> bool:
+        # Returns False when a batch is already running; the caller reports its progress instead.
+        if self.running:
+            return False
+        # Drafting reads the store, so it runs here on the event loop like every other
+        # store access; only rendering and file writes move to the pool.
+        jobs = build_jobs(source, select_cohort(source))
+        self.state, self.renewals, self.report, self.error = "running", len(jobs), None, None
+        self._task = asyncio.get_running_loop().create_task(self._run(jobs))
+        return True
+
+    async def wait(self) -> None:
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    def message(self) -> str:
+        if self.state == "running":
+            return f"Generating offers and contracts for {self.renewals} renewals..."
+        if self.state == "failed":
+            return f"Document generation failed: {self.error}"
+        if self.report is not None:
+            return self.report.summary()
+        return "No document batch has run yet."
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _run(self, jobs: list[DocumentJob]) -> None:
+        try:
+            if self._pool is None and self.workers > 1:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_load_templates)
+            self.report = await asyncio.get_running_loop().run_in_executor(
+                None, render_documents, jobs, self.output_dir, self.workers, 100, self._pool
+            )
+            self.state = "done"
+        except Exception as exc:
+            logger.exception("Document batch failed")
+            self.error = str(exc) or type(exc).__name__
+            self.state = "failed"
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from app.services.mock_store import ActivityItem, MockStore, Ticket
+from app.services.search import tokenize
+
+
+logger = logging.getLogger(__name__)
+
+TICKET_STATUSES = ["Reported", "Assigned", "En Route", "In Progress", "Resolved"]
+SLA_MINUTES = {"High": 60, "Medium": 240, "Low": 1440}
+
+# Keyword index: normalized token -> category. Arabic keywords go through the same
+# normalization as search, so spelling variants (ة/ه, أ/ا, diacritics) still match.
+# Category names are keywords too, so the "<category> issue" titles intake creates classify
+# as themselves ("General issue" has no keyword and falls through to General).
+_CATEGORY_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "HVAC": ("ac", "aircon", "air", "cooling", "hvac", "hot", "thermostat", "مكيف", "تكييف", "تبريد", "حرارة"),
+    "Plumbing": (
+        "leak", "leaking", "water", "pipe", "drain", "toilet", "flood", "flooding", "plumbing", "plumber",
+        "تسريب", "تسرب", "ماء", "مياه", "سباكة",
+    ),
+    "Electrical": (
+        "power", "electric", "electrical", "electricity", "outage", "socket", "spark", "sparks", "lights",
+        "كهرباء", "انقطاع",
+    ),
+    "Pest Control": ("pest", "cockroach", "cockroaches", "insects", "rats", "حشرات", "صراصير"),
+    "Locks & Doors": ("lock", "locks", "locked", "door", "doors", "key", "keys", "قفل", "باب"),
+}
+_URGENT_KEYWORDS = (
+    "urgent", "emergency", "flood", "flooding", "fire", "spark", "sparks", "outage", "smoke", "طارئ", "حريق", "عاجل",
+)
+_LOW_KEYWORDS = ("whenever", "minor", "small", "cosmetic", "بسيط")
+
+_KEYWORD_INDEX: dict[str, str] = {
+    token: category
+    for category, keywords in _CATEGORY_KEYWORDS.items()
+    for keyword in keywords
+    for token in tokenize(keyword)
+}
+_URGENT_TOKENS = frozenset(token for keyword in _URGENT_KEYWORDS for token in tokenize(keyword))
+_LOW_TOKENS = frozenset(token for keyword in _LOW_KEYWORDS for token in tokenize(keyword))
+_TICKET_NUMBER = re.compile(r"^M-(\d+)$")
+# Arabic definite article; "المكيف" should match the keyword "مكيف".
+_ARABIC_ARTICLE = "ال"
+
+
+@dataclass
+class IntakeMessage:
+    sender: str
+    tenant_name: str
+    unit: str
+    area: str
+    text: str
+    received_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class Classification:
+    category: str
+    priority: str
+
+
+def _keyword_category(token: str) -> str | None:
+    category = _KEYWORD_INDEX.get(token)
+    if category is None and token.startswith(_ARABIC_ARTICLE) and len(token) > len(_ARABIC_ARTICLE) + 1:
+        category = _KEYWORD_INDEX.get(token[len(_ARABIC_ARTICLE):])
+    return category
+
+
+def classify(text: str) -> Classification:
+    tokens = tokenize(text)
+    votes: dict[str, int] = {}
+    for token in tokens:
+        category = _keyword_category(token)
+        if category is not None:
+            votes[category] = votes.get(category, 0) + 1
+    category = max(votes, key=votes.__getitem__) if votes else "General"
+    if _URGENT_TOKENS.intersection(tokens):
+        priority = "High"
+    elif _LOW_TOKENS.intersection(tokens):
+        priority = "Low"
+    else:
+        priority = "Medium"
+    return Classification(category=category, priority=priority)
+
+
+def ticket_category(ticket: Ticket) -> str:
+    # Tickets restored from older journals have no stored category; classify their title.
+    return ticket.category or classify(ticket.title).category
+
+
+@dataclass
+class IntakeStats:
+    received: int = 0
+    processed: int = 0
+    duplicates: int = 0
+    tickets_created: int = 0
+    batches: int = 0
+    # Messages in batches that raised; they are logged and not retried.
+    failed: int = 0
+    max_lag_ms: float = 0.0
+    last_batch_ms: float = 0.0
+
+
+@dataclass
+class IntakePipeline:
+    target: MockStore
+    batch_size: int = 256
+    linger_seconds: float = 0.02
+    queue: deque[IntakeMessage] = field(default_factory=deque)
+    stats: IntakeStats = field(default_factory=IntakeStats)
+    # (area, unit, category) -> ticket id of the open ticket that absorbs repeat reports.
+    # Unit labels repeat across buildings, so the area is part of the key.
+    open_reports: dict[tuple[str, str, str], str] = field(default_factory=dict)
+    _next_number: int = 0
+    _wakeup: asyncio.Event | None = field(default=None, repr=False)
+    _worker: asyncio.Task[None] | None = field(default=None, repr=False)
+
+    @classmethod
+    def from_store(cls, target: MockStore) -> IntakePipeline:
+        pipeline = cls(target=target)
+        pipeline.reindex()
+        target.subscribe(pipeline.on_store_event)
+        return pipeline
+
+    def reindex(self) -> None:
+        self.open_reports.clear()
+        numbers = [1000]
+        for ticket_id, ticket in self.target.tickets.items():
+            if match := _TICKET_NUMBER.match(ticket_id):
+                numbers.append(int(match.group(1)))
+            if ticket.status_index < len(ticket.statuses) - 1:
+                self.open_reports[(ticket.area, ticket.unit, ticket_category(ticket))] = ticket_id
+        self._next_number = max(numbers) + 1
+
+    def on_store_event(self, kind: str, key: str | None, entity: Any) -> None:
+        if kind == "reset":
+            self.reindex()
+
+    @property
+    def lag_ms(self) -> float:
+        if not self.queue:
+            return 0.0
+        return (time.monotonic() - self.queue[0].received_at) * 1000
+
+    def submit(self, messages: list[IntakeMessage]) -> int:
+        self.queue.extend(messages)
+        self.stats.received += len(messages)
+        self._ensure_worker()
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return len(self.queue)
+
+    def drain(self) -> None:
+        while self.queue:
+            self.process_batch(self._take_batch())
+
+    def process_batch(self, batch: list[IntakeMessage]) -> list[Ticket]:
+        started = time.perf_counter()
+        created: dict[str, Ticket] = {}
+        updated: dict[str, Ticket] = {}
+        activity: list[ActivityItem] = []
+        stamp = datetime.now().strftime("%H:%M")
+        for message in batch:
+            result = classify(message.text)
+            key = (message.area, message.unit, result.category)
+            existing_id = self.open_reports.get(key)
+            existing = None
+            if existing_id is not None:
+                existing = created.get(existing_id) or self.target.tickets.get(existing_id)
+            if existing is not None and existing.status_index < len(existing.statuses) - 1:
+                # Repeat report for an open issue: fold it into the existing ticket.
+                existing.notes = f"{existing.notes} | +1 report via WhatsApp from {message.tenant_name}"
+                if SLA_MINUTES[result.priority] < SLA_MINUTES.get(existing.priority, 0):
+                    existing.priority = result.priority
+                if existing.ticket_id not in created:
+                    updated[existing.ticket_id] = existing
+                self.stats.duplicates += 1
+                continue
+            ticket = Ticket(
+                ticket_id=f"M-{self._next_number}",
+                title=f"{result.category} issue",
+                unit=message.unit,
+                area=message.area,
+                statuses=list(TICKET_STATUSES),
+                status_index=0,
+                sla_minutes_remaining=SLA_MINUTES[result.priority],
+                tenant_name=message.tenant_name,
+                vendor_name="Unassigned",
+                priority=result.priority,
+                notes=f"Reported via WhatsApp: {message.text}",
+                category=result.category,
+            )
+            self._next_number += 1
+            self.open_reports[key] = ticket.ticket_id
+            created[ticket.ticket_id] = ticket
+            activity.append(
+                ActivityItem(
+                    text=f"Created ticket #{ticket.ticket_id} ({result.category}, {result.priority}) for {message.unit}",
+                    timestamp=stamp,
+                )
+            )
+        if created or updated:
+            self.target.save_tickets([*created.values(), *updated.values()], activity)
+
+        now = time.monotonic()
+        self.stats.batches += 1
+        self.stats.processed += len(batch)
+        self.stats.tickets_created += len(created)
+        self.stats.max_lag_ms = max(self.stats.max_lag_ms, (now - batch[0].received_at) * 1000)
+        self.stats.last_batch_ms = (time.perf_counter() - started) * 1000
+        return list(created.values())
+
+    async def run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self.queue:
+                if len(self.queue) < self.batch_size:
+                    # Let a burst accumulate so it is classified and stored as one batch.
+                    await asyncio.sleep(self.linger_seconds)
+                batch = self._take_batch()
+                try:
+                    self.process_batch(batch)
+                except Exception:
+                    # A failing batch (e.g. a store listener's write) must not stop the worker.
+                    self.stats.failed += len(batch)
+                    logger.exception(
+                        "Intake batch of %d message(s) failed; first from %s", len(batch), batch[0].sender
+                    )
+                await asyncio.sleep(0)
+
+    def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    def _take_batch(self) -> list[IntakeMessage]:
+        count = min(self.batch_size, len(self.queue))
+        return [self.queue.popleft() for _ in range(count)]
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (CLI, tests): callers process the queue with drain().
+            return
+        self._wakeup = asyncio.Event()
+        self._worker = loop.create_task(self.run())
+
@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import json
+import logging
+import io
+import os
+import pickle
+import shutil
+import struct
+import threading
+from array import array
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+from app.services.mock_store import (
+    ActivityItem,
+    ChequeSchedule,
+    ComplianceRecord,
+    ContractDraft,
+    MockStore,
+    RenewalCase,
+    Ticket,
+    Vendor,
+)
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 4
+# Format 4 files: magic, header length, blob count, JSON header, blob lengths, blobs.
+_SNAPSHOT_MAGIC = b"HBSNAP\x00\x04"
+_SNAPSHOT_PREFIX = struct.Struct("<QI")
+# Formats 1-3 were pickled. They are still read, but only through _PlainUnpickler.
+_PICKLED_FORMATS = (1, 2, 3)
+# Positional (unnamed) snapshot formats and the field order that differed from today's classes.
+_LEGACY_FIELDS: dict[int, dict[str, list[str]]] = {
+    1: {
+        "Vendor": [
+            "vendor_id", "name", "specialty", "area", "availability", "response_minutes", "rating",
+            "jobs_completed", "ai_recommended", "latitude", "longitude", "license_days_left",
+            "insurance_valid", "emirates_id_verified", "trade_license_verified",
+        ],
+    },
+    2: {},
+}
+
+_ENTITY_TYPES: dict[str, type] = {
+    "ticket": Ticket,
+    "vendor": Vendor,
+    "renewal": RenewalCase,
+    "activity": ActivityItem,
+}
+_FIELD_NAMES = {cls: frozenset(f.name for f in fields(cls)) for cls in _ENTITY_TYPES.values()}
+_KEYED_COLLECTIONS = {"ticket": "tickets", "vendor": "vendors", "renewal": "renewals"}
+_COLLECTIONS = ("tickets", "vendors", "renewals", "contracts", "activity_log", "compliance", "cheque_schedules")
+
+
+def _encode_columns(cls: type, items: list[Any], keys: list[str] | None = None) -> list[tuple]:
+    # Column-wise layout; low-cardinality columns (area, status, stage, ...) are
+    # dictionary-encoded into a packed uint32 array so restore touches far fewer objects.
+    # List values (ticket statuses) are encoded as tuples and rebuilt as fresh lists, and a
+    # column that repeats the collection keys (ticket_id, vendor_id) is not stored twice.
+    columns: list[tuple] = []
+    for f in fields(cls):
+        values = [getattr(item, f.name) for item in items]
+        if keys is not None and values == keys:
+            columns.append((f.name, "keys"))
+            continue
+        kind = "dict"
+        if values and isinstance(values[0], list):
+            kind, values = "list", [tuple(value) for value in values]
+        codes: dict[Any, int] | None = {}
+        try:
+            packed = array("I", [codes.setdefault(value, len(codes)) for value in values])
+        except TypeError:
+            codes = None
+        if codes is not None and len(codes) * 4 < len(values):
+            columns.append((f.name, kind, list(codes), packed.tobytes()))
+        elif kind == "list":
+            columns.append((f.name, "raw", [list(value) for value in values]))
+        else:
+            columns.append((f.name, "raw", values))
+    return columns
+
+
+def _decode_columns(cls: type, columns: list[tuple], keys: list[str] | None = None) -> list[Any]:
+    # Columns are matched by field name: fields a newer build dropped are ignored and
+    # fields it added take their dataclass defaults.
+    known = {f.name for f in fields(cls)}
+    names: list[str] = []
+    decoded: list[Iterable[Any]] = []
+    for column in columns:
+        name, kind = column[0], column[1]
+        if name not in known:
+            continue
+        if kind == "keys":
+            values = keys or []
+        elif kind in ("dict", "list"):
+            table, packed = column[2], array("I")
+            packed.frombytes(column[3])
+            # Lazy maps: values go straight into the constructors without per-column lists.
+            values = map(table.__getitem__, packed)
+            if kind == "list":
+                values = map(list, values)
+        else:
+            values = column[2]
+        names.append(name)
+        decoded.append(values)
+    if not decoded:
+        return []
+    if names == [f.name for f in fields(cls)]:
+        return list(map(cls, *decoded))
+    return [cls(**dict(zip(names, row))) for row in zip(*decoded)]
+
+
+def _payload_columns(payload: dict[str, Any]) -> Iterator[list[Any]]:
+    for name in ("tickets", "vendors", "renewals", "contracts"):
+        yield from payload[name][1]
+    for name in ("activity_log", "compliance", "cheque_schedules"):
+        yield from payload[name]
+
+
+class _PlainUnpickler(pickle.Unpickler):
+    # Older snapshots only hold builtin containers, strings, numbers and bytes. Refusing
+    # every global means a crafted file can't name a callable to run while loading.
+    def find_class(self, module: str, name: str) -> Any:
+        raise pickle.UnpicklingError(f"Snapshots may not reference {module}.{name}")
+
+
+def encode_snapshot(source: MockStore, seq: int) -> bytes:
+    tickets, vendors = list(source.tickets), list(source.vendors)
+    payload = {
+        "format": SNAPSHOT_FORMAT,
+        "seq": seq,
+        "tickets": (tickets, _encode_columns(Ticket, list(source.tickets.values()), tickets)),
+        "vendors": (vendors, _encode_columns(Vendor, list(source.vendors.values()), vendors)),
+        "renewals": (list(source.renewals), _encode_columns(RenewalCase, list(source.renewals.values()))),
+        "contracts": (list(source.contracts), _encode_columns(ContractDraft, list(source.contracts.values()))),
+        "activity_log": _encode_columns(ActivityItem, source.activity_log),
+        "compliance": _encode_columns(ComplianceRecord, source.compliance),
+        "cheque_schedules": _encode_columns(ChequeSchedule, source.cheque_schedules),
+    }
+    # Plain data only: JSON for the structure, packed code arrays as raw blobs after it.
+    blobs: list[bytes] = []
+
+    def blob_index(value: Any) -> int:
+        if not isinstance(value, bytes):
+            raise TypeError(f"Cannot store {type(value).__name__} in a snapshot")
+        blobs.append(value)
+        return len(blobs) - 1
+
+    header = json.dumps(payload, default=blob_index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"".join(
+        [
+            _SNAPSHOT_MAGIC,
+            _SNAPSHOT_PREFIX.pack(len(header), len(blobs)),
+            header,
+            array("Q", [len(blob) for blob in blobs]).tobytes(),
+            *blobs,
+        ]
+    )
+
+
+def read_snapshot_payload(data: bytes) -> dict[str, Any]:
+    if not data.startswith(_SNAPSHOT_MAGIC):
+        payload = _PlainUnpickler(io.BytesIO(data)).load()
+        if not isinstance(payload, dict):
+            raise ValueError("Not a snapshot")
+        return payload
+    offset = len(_SNAPSHOT_MAGIC)
+    header_length, blob_count = _SNAPSHOT_PREFIX.unpack_from(data, offset)
+    offset += _SNAPSHOT_PREFIX.size
+    payload = json.loads(data[offset : offset + header_length])
+    offset += header_length
+    lengths = array("Q")
+    lengths.frombytes(data[offset : offset + blob_count * lengths.itemsize])
+    offset += blob_count * lengths.itemsize
+    blobs: list[bytes] = []
+    for length in lengths:
+        blobs.append(data[offset : offset + length])
+        offset += length
+    for column in _payload_columns(payload):
+        if column[1] in ("dict", "list"):
+            column[3] = blobs[column[3]]
+    return payload
+
+
+def _legacy_columns(cls: type, columns: list[tuple], snapshot_format: int) -> list[tuple]:
+    # Formats before 3 stored columns positionally in the field order of that release.
+    names = _LEGACY_FIELDS[snapshot_format].get(cls.__name__) or [f.name for f in fields(cls)]
+    return [(name, *column) for name, column in zip(names, columns)]
+
+
+def decode_snapshot(data: bytes, target: MockStore) -> int:
+    payload = read_snapshot_payload(data)
+    snapshot_format = payload.get("format")
+    if snapshot_format != SNAPSHOT_FORMAT and snapshot_format not in _PICKLED_FORMATS:
+        raise ValueError(f"Unsupported snapshot format: {snapshot_format!r}")
+
+    def columns_of(cls: type, columns: list[tuple]) -> list[tuple]:
+        if snapshot_format in _LEGACY_FIELDS:
+            return _legacy_columns(cls, columns, snapshot_format)
+        return columns
+
+    for name, cls in (
+        ("tickets", Ticket),
+        ("vendors", Vendor),
+        ("renewals", RenewalCase),
+        ("contracts", ContractDraft),
+    ):
+        keys, columns = payload[name]
+        setattr(target, name, dict(zip(keys, _decode_columns(cls, columns_of(cls, columns), keys))))
+    target.activity_log = _decode_columns(ActivityItem, columns_of(ActivityItem, payload["activity_log"]))
+    target.compliance = _decode_columns(ComplianceRecord, columns_of(ComplianceRecord, payload["compliance"]))
+    target.cheque_schedules = _decode_columns(
+        ChequeSchedule, columns_of(ChequeSchedule, payload["cheque_schedules"])
+    )
+    return payload["seq"]
+
+
+def _detached_copy(source: MockStore) -> MockStore:
+    # New containers around the same entities; restore and snapshots only ever replace entities.
+    return MockStore(**{name: type(getattr(source, name))(getattr(source, name)) for name in _COLLECTIONS})
+
+
+@dataclass
+class JournalEntry:
+    seq: int
+    at: str
+    kind: str
+    key: str | None
+    entity: dict[str, Any]
+
+
+@dataclass
+class MutationJournal:
+    directory: Path
+    snapshot_every: int = 10_000
+    fsync: bool = False
+    seq: int = 0
+    snapshot_seq: int = 0
+    _segment: IO[str] | None = field(default=None, repr=False)
+    _source: MockStore | None = field(default=None, repr=False)
+    _snapshot_thread: threading.Thread | None = field(default=None, repr=False)
+
+    @classmethod
+    def open(cls, source: MockStore, directory: str | Path, snapshot_every: int = 10_000) -> MutationJournal:
+        journal = cls(directory=Path(directory), snapshot_every=snapshot_every)
+        journal.directory.mkdir(parents=True, exist_ok=True)
+        journal._source = source
+        try:
+            restored = journal.restore(source)
+        except Exception:
+            # An unreadable journal must not keep the app from starting: set it aside for
+            # inspection and start over from the freshly seeded store.
+            logger.warning("Could not restore journal in %s; re-seeding", journal.directory, exc_info=True)
+            journal._quarantine()
+            restored = False
+        if not restored:
+            # Nothing usable on disk: the freshly seeded store becomes the baseline snapshot.
+            journal.snapshot()
+        source.subscribe(journal.on_store_event)
+        return journal
+
+    def restore(self, target: MockStore) -> bool:
+        snapshots = sorted(self.directory.glob("snapshot-*.bin"))
+        segments = self._segments()
+        if not snapshots and not segments:
+            return False
+
+        # Restore into a scratch store so a failure part-way leaves ``target`` as seeded.
+        scratch = _detached_copy(target)
+        snapshot_seq = 0
+        if snapshots:
+            snapshot_seq = decode_snapshot(snapshots[-1].read_bytes(), scratch)
+        seq = snapshot_seq
+        for entry in self._iter_tail(segments, after=snapshot_seq):
+            self._apply(scratch, entry)
+            seq = entry.seq
+        for name in _COLLECTIONS:
+            setattr(target, name, getattr(scratch, name))
+        self.seq, self.snapshot_seq = seq, snapshot_seq
+        target.notify_reset()
+        return True
+
+    def on_store_event(self, kind: str, key: str | None, entity: Any) -> None:
+        if kind == "reset":
+            self.snapshot()
+            return
+        self.seq += 1
+        record = {
+            "seq": self.seq,
+            "at": datetime.now().isoformat(timespec="milliseconds"),
+            "kind": kind,
+            "key": key,
+            "entity": asdict(entity),
+        }
+        segment = self._segment or self._open_segment(self.seq)
+        segment.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        segment.flush()
+        if self.fsync:
+            os.fsync(segment.fileno())
+        if self.seq - self.snapshot_seq >= self.snapshot_every:
+            self.snapshot_in_background()
+
+    def snapshot(self) -> Path:
+        # Blocking; used when opening and after a reset, before the store serves requests.
+        self.wait_for_snapshot()
+        self._close_segment()
+        return self._write_snapshot(_detached_copy(self._attached_source()), self.seq)
+
+    def snapshot_in_background(self) -> bool:
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return False
+        # Only the collection containers are copied here; encoding runs on a thread. An
+        # entity mutated while it is being encoded also has a journal entry after `seq`,
+        # and replaying that entry on restore overwrites whatever the snapshot caught.
+        view, seq = _detached_copy(self._attached_source()), self.seq
+        self._close_segment()
+        self._snapshot_thread = threading.Thread(
+            target=self._write_snapshot, args=(view, seq), name="journal-snapshot", daemon=True
+        )
+        self._snapshot_thread.start()
+        return True
+
+    def wait_for_snapshot(self) -> None:
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+
+    def _quarantine(self) -> None:
+        stamp = f"{datetime.now():%Y%m%d-%H%M%S}"
+        aside = self.directory / f"unrestorable-{stamp}"
+        attempt = 1
+        while aside.exists():
+            attempt += 1
+            aside = self.directory / f"unrestorable-{stamp}-{attempt}"
+        aside.mkdir()
+        for path in [*self.directory.glob("snapshot-*"), *self._segments()]:
+            shutil.move(str(path), aside / path.name)
+        self.seq = self.snapshot_seq = 0
+
+    def _attached_source(self) -> MockStore:
+        if self._source is None:
+            raise RuntimeError("Journal is not attached to a store")
+        return self._source
+
+    def _write_snapshot(self, view: MockStore, seq: int) -> Path:
+        path = self.directory / f"snapshot-{seq:012d}.bin"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(encode_snapshot(view, seq))
+        os.replace(tmp_path, path)
+        self.snapshot_seq = max(self.snapshot_seq, seq)
+        # Older segments stay on disk as the audit trail; restarts only read from the
+        # newest snapshot on.
+        for stale in sorted(self.directory.glob("snapshot-*.bin"))[:-2]:
+            stale.unlink()
+        return path
+
+    def iter_entries(self, after: int = 0) -> Iterator[JournalEntry]:
+        return self._iter_tail(self._segments(), after=after)
+
+    def close(self) -> None:
+        self.wait_for_snapshot()
+        self._close_segment()
+
+    def _close_segment(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def _segments(self) -> list[Path]:
+        return sorted(self.directory.glob("journal-*.jsonl"))
+
+    def _open_segment(self, first_seq: int) -> IO[str]:
+        self._close_segment()
+        path = self.directory / f"journal-{first_seq:012d}.jsonl"
+        self._segment = path.open("a", encoding="utf-8")
+        return self._segment
+
+    def _iter_tail(self, segments: list[Path], after: int) -> Iterator[JournalEntry]:
+        starts = [int(path.stem.split("-", 1)[1]) for path in segments]
+        # Skip whole segments that end before ``after``; only the last one at or before it can straddle.
+        first = 0
+        for position, start in enumerate(starts):
+            if start <= after + 1:
+                first = position
+        for path in segments[first:]:
+            with path.open(encoding="utf-8") as handle:
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final write from a crash; everything before it is intact.
+                        break
+                    if record["seq"] > after:
+                        yield JournalEntry(**record)
+
+    def _apply(self, target: MockStore, entry: JournalEntry) -> None:
+        cls = _ENTITY_TYPES[entry.kind]
+        # Entries written by older builds may carry fields this build no longer has.
+        known = _FIELD_NAMES[cls]
+        entity = cls(**{name: value for name, value in entry.entity.items() if name in known})
+        if entry.kind == "activity":
+            target.activity_log.insert(0, entity)
+        else:
+            getattr(target, _KEYED_COLLECTIONS[entry.kind])[entry.key] = entity
+
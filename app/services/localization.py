@@ -39,7 +39,16 @@ _EN_LABELS: dict[str, Any] = {
     "send": "Send to Tenant",
     "process_all": "Process all renewals",
     "notices": "Send 90-day notices",
+    "generate_documents": "Generate renewal documents",
     "demo_mode": "Hackathon demo data",
+    "search_placeholder": "Search tickets, units, tenants, vendors",
+    "search_empty": "No matches",
+    "search_kinds": {
+        "ticket": "Ticket",
+        "unit": "Unit",
+        "tenant": "Tenant",
+        "vendor": "Vendor",
+    },
 }
 
 _AR_LABELS: dict[str, Any] = {
@@ -70,7 +79,16 @@ _AR_LABELS: dict[str, Any] = {
     "send": "إرسال إلى المستأجر",
     "process_all": "معالجة جميع التجديدات",
     "notices": "إرسال إشعارات 90 يوم",
+    "generate_documents": "إنشاء مستندات التجديد",
     "demo_mode": "بيانات عرض الهاكاثون",
+    "search_placeholder": "ابحث عن البلاغات والوحدات والمستأجرين والمورّدين",
+    "search_empty": "لا توجد نتائج",
+    "search_kinds": {
+        "ticket": "بلاغ",
+        "unit": "وحدة",
+        "tenant": "مستأجر",
+        "vendor": "مورّد",
+    },
 }
 
 
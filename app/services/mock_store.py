@@ -1,11 +1,41 @@
 from __future__ import annotations
 
+import random
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Literal
+from datetime import date, datetime
+from typing import Any, Callable, ClassVar, Literal
 
 
 StatusType = Literal["Active", "Processing", "Idle"]
+StoreListener = Callable[[str, str | None, Any], None]
+FetchKey = tuple[Any, ...]
+
+_FETCHERS: dict[str, str] = {
+    "agent_state": "get_agent_state",
+    "activity": "get_activity_slice",
+    "ticket": "get_ticket",
+    "vendors": "get_vendors",
+    "renewal": "get_renewal",
+    "renewal_buckets": "get_renewals_by_stage",
+    "rera": "calculate_rera",
+    "contract": "get_contract",
+    "compliance": "get_compliance",
+}
+
+# Vocabulary for synthetic portfolios (load tests, benchmarks, large local seeds).
+_SYNTHETIC_AREAS = ["Al Barsha", "Dubai Marina", "JBR", "Business Bay", "Jumeirah", "Deira", "Al Nahda"]
+_SYNTHETIC_TITLES = [
+    ("AC Repair", "HVAC"),
+    ("Plumbing Leak", "Plumbing"),
+    ("Electrical Fault", "Electrical"),
+    ("Door Lock", "Locks & Doors"),
+    ("Pest Control", "Pest Control"),
+    ("Water Heater", "Plumbing"),
+]
+_SYNTHETIC_FIRST_NAMES = ["Sara", "Ahmed", "Nadia", "Zaid", "Rashid", "Fatima", "Omar", "Layla", "سارة", "أحمد", "فاطمة"]
+_SYNTHETIC_LAST_NAMES = ["Ahmad", "Farooq", "Omar", "Malik", "Khan", "Haddad", "Saleh", "الحمادي", "المنصوري"]
+_SYNTHETIC_STATUSES = ["Reported", "Assigned", "En Route", "In Progress", "Resolved"]
+_SYNTHETIC_ID_BASE = 10_000
 
 
 @dataclass
@@ -19,6 +49,8 @@ class AgentState:
 class ActivityItem:
     text: str
     timestamp: str
+    # ISO date the action happened on; the feed only shows HH:MM, the rollups count per day.
+    date: str = field(default_factory=lambda: date.today().isoformat())
 
 
 @dataclass
@@ -34,6 +66,8 @@ class Ticket:
     vendor_name: str
     priority: str
     notes: str
+    # Intake/vendor category ("HVAC", "Plumbing", ...); empty on records written before it existed.
+    category: str = ""
 
 
 @dataclass
@@ -46,7 +80,6 @@ class Vendor:
     response_minutes: int
     rating: float
     jobs_completed: int
-    ai_recommended: bool
     latitude: float
     longitude: float
     license_days_left: int
@@ -112,6 +145,9 @@ class ChequeSchedule:
 
 @dataclass
 class MockStore:
+    # In-memory reads never block, so request loaders call fetch_many inline.
+    blocking: ClassVar[bool] = False
+
     agent_status_cycle: list[StatusType] = field(default_factory=lambda: ["Active", "Processing", "Idle"])
     status_cursor: int = 0
     activity_cursor: int = 0
@@ -122,6 +158,15 @@ class MockStore:
     contracts: dict[str, ContractDraft] = field(default_factory=dict)
     compliance: list[ComplianceRecord] = field(default_factory=list)
     cheque_schedules: list[ChequeSchedule] = field(default_factory=list)
+    listeners: list[StoreListener] = field(default_factory=list, repr=False)
+
+    def subscribe(self, listener: StoreListener) -> None:
+        # Listeners receive (kind, key, entity); a "reset" event means rebuild from the store.
+        self.listeners.append(listener)
+
+    def _notify(self, kind: str, key: str | None, entity: Any) -> None:
+        for listener in self.listeners:
+            listener(kind, key, entity)
 
     def seed(self) -> None:
         self.activity_log = [
@@ -146,6 +191,7 @@ class MockStore:
                 vendor_name="Ahmad HVAC",
                 priority="Medium",
                 notes="Priority: Medium. Tenant comfort issue. No safety risk.",
+                category="HVAC",
             ),
             "M-1289": Ticket(
                 ticket_id="M-1289",
@@ -159,6 +205,7 @@ class MockStore:
                 vendor_name="Marina Plumbers",
                 priority="High",
                 notes="Potential water damage risk. Escalated for immediate attendance.",
+                category="Plumbing",
             ),
         }
 
@@ -172,7 +219,6 @@ class MockStore:
                 response_minutes=38,
                 rating=4.8,
                 jobs_completed=231,
-                ai_recommended=True,
                 latitude=25.103,
                 longitude=55.193,
                 license_days_left=186,
@@ -189,7 +235,6 @@ class MockStore:
                 response_minutes=55,
                 rating=4.6,
                 jobs_completed=198,
-                ai_recommended=False,
                 latitude=25.081,
                 longitude=55.141,
                 license_days_left=15,
@@ -206,7 +251,6 @@ class MockStore:
                 response_minutes=42,
                 rating=4.7,
                 jobs_completed=164,
-                ai_recommended=False,
                 latitude=25.079,
                 longitude=55.136,
                 license_days_left=244,
@@ -223,7 +267,6 @@ class MockStore:
                 response_minutes=61,
                 rating=4.5,
                 jobs_completed=422,
-                ai_recommended=False,
                 latitude=25.111,
                 longitude=55.207,
                 license_days_left=92,
@@ -334,10 +377,64 @@ class MockStore:
                 cheque_amounts_aed=[21750, 21750, 21750, 21750],
             )
         ]
+        self.notify_reset()
+
+    def seed_synthetic(self, records: int, seed: int = 7) -> None:
+        # Adds records // 2 tickets and records // 4 renewals on top of whatever is loaded.
+        # Ids start at 10000 so they never collide with the demo seed.
+        rng = random.Random(seed)
+        for i in range(_SYNTHETIC_ID_BASE, _SYNTHETIC_ID_BASE + records // 2):
+            area = rng.choice(_SYNTHETIC_AREAS)
+            title, category = rng.choice(_SYNTHETIC_TITLES)
+            self.tickets[f"M-{i}"] = Ticket(
+                ticket_id=f"M-{i}",
+                title=title,
+                unit=f"Unit {rng.randint(100, 9999)}",
+                area=area,
+                statuses=list(_SYNTHETIC_STATUSES),
+                status_index=rng.randrange(len(_SYNTHETIC_STATUSES)),
+                sla_minutes_remaining=rng.randint(0, 240),
+                tenant_name=f"{rng.choice(_SYNTHETIC_FIRST_NAMES)} {rng.choice(_SYNTHETIC_LAST_NAMES)}",
+                vendor_name=f"{area} Services",
+                priority=rng.choice(["Low", "Medium", "High"]),
+                notes="",
+                category=category,
+            )
+        for i in range(_SYNTHETIC_ID_BASE, _SYNTHETIC_ID_BASE + records // 4):
+            self.renewals[f"U-{i}"] = RenewalCase(
+                unit=f"Unit {i}",
+                tenant_name=f"{rng.choice(_SYNTHETIC_FIRST_NAMES)} {rng.choice(_SYNTHETIC_LAST_NAMES)}",
+                current_rent_aed=rng.randint(50_000, 200_000),
+                expiry_date="01/01/2027",
+                days_out=rng.randint(1, 200),
+                stage="60-90 Days",
+                ai_status="RERA check pending",
+                area=rng.choice(_SYNTHETIC_AREAS),
+                bedrooms="2BR apartment",
+                market_average_aed=100_000,
+                max_allowed_increase_pct=4.0,
+            )
+        self.notify_reset()
+
+    def notify_reset(self) -> None:
+        self._notify("reset", None, self)
+
+    def fetch_many(self, keys: list[FetchKey]) -> list[Any]:
+        # Batch read entry point: one call per request instead of one per lookup.
+        # Missing entities come back as the KeyError rather than failing the whole batch.
+        results: list[Any] = []
+        for kind, *args in keys:
+            fetch = getattr(self, _FETCHERS[kind])
+            try:
+                results.append(fetch(*args))
+            except KeyError as exc:
+                results.append(exc)
+        return results
 
     def get_agent_state(self) -> AgentState:
         self.status_cursor = (self.status_cursor + 1) % len(self.agent_status_cycle)
         status = self.agent_status_cycle[self.status_cursor]
+        # The response time is a canned figure; the dashboard labels it as demo data.
         return AgentState(status=status, actions_today=47 + self.status_cursor, response_time_seconds=8)
 
     def get_activity_slice(self, limit: int = 3) -> list[ActivityItem]:
@@ -351,26 +448,44 @@ class MockStore:
     def get_ticket(self, ticket_id: str) -> Ticket:
         return self.tickets[ticket_id]
 
+    def save_tickets(self, tickets: list[Ticket], activity: list[ActivityItem]) -> None:
+        for ticket in tickets:
+            self.tickets[ticket.ticket_id] = ticket
+        self.activity_log[:0] = reversed(activity)
+        for ticket in tickets:
+            self._notify("ticket", ticket.ticket_id, ticket)
+        for item in activity:
+            self._notify("activity", None, item)
+
     def get_vendors(self) -> list[Vendor]:
         return list(self.vendors.values())
 
     def assign_vendor(self, ticket_id: str, vendor_id: str) -> tuple[Ticket, Vendor]:
-        ticket = self.tickets[ticket_id]
         vendor = self.vendors[vendor_id]
-        ticket.vendor_name = vendor.name
+        ticket = self.attach_vendor(ticket_id, vendor.name)
+        self.reserve_vendor(vendor_id)
+        self.record_activity(assignment_activity(ticket, vendor))
+        return ticket, vendor
+
+    # The steps of assign_vendor are separate so a sharded router can apply them on
+    # different shards when the ticket and vendor live in different areas.
+    def attach_vendor(self, ticket_id: str, vendor_name: str) -> Ticket:
+        ticket = self.tickets[ticket_id]
+        ticket.vendor_name = vendor_name
         if ticket.status_index < 1:
             ticket.status_index = 1
+        self._notify("ticket", ticket_id, ticket)
+        return ticket
+
+    def reserve_vendor(self, vendor_id: str) -> Vendor:
+        vendor = self.vendors[vendor_id]
         vendor.availability = "busy"
-        for existing in self.vendors.values():
-            existing.ai_recommended = existing.vendor_id == vendor_id
-        self.activity_log.insert(
-            0,
-            ActivityItem(
-                text=f"AI-assisted assignment: {vendor.name} -> {ticket.ticket_id} ({ticket.unit})",
-                timestamp=datetime.now().strftime("%H:%M"),
-            ),
-        )
-        return ticket, vendor
+        self._notify("vendor", vendor_id, vendor)
+        return vendor
+
+    def record_activity(self, activity: ActivityItem) -> None:
+        self.activity_log.insert(0, activity)
+        self._notify("activity", None, activity)
 
     def advance_ticket(self, ticket_id: str) -> Ticket:
         ticket = self.tickets[ticket_id]
@@ -378,6 +493,7 @@ class MockStore:
             ticket.status_index += 1
         if ticket.sla_minutes_remaining > 0:
             ticket.sla_minutes_remaining -= 2
+        self._notify("ticket", ticket_id, ticket)
         return ticket
 
     def get_renewals_by_stage(self) -> dict[str, list[RenewalCase]]:
@@ -414,18 +530,39 @@ class MockStore:
     def get_contract(self, unit_id: str) -> ContractDraft:
         return self.contracts[unit_id]
 
+    def get_compliance(self) -> list[ComplianceRecord]:
+        return list(self.compliance)
+
     def bulk_process_renewals(self) -> str:
+        return bulk_process_message(self.mark_offers_ready())
+
+    def mark_offers_ready(self) -> int:
         ready = 0
-        for renewal in self.renewals.values():
+        for unit_id, renewal in self.renewals.items():
             if renewal.ai_status == "RERA check pending":
                 renewal.ai_status = "Offer ready"
                 ready += 1
-        return f"Processed {ready} renewal cases. Manager review queue updated."
+                self._notify("renewal", unit_id, renewal)
+        return ready
 
     def send_notices(self) -> str:
-        count = sum(1 for renewal in self.renewals.values() if renewal.days_out >= 90)
-        return f"Sent {count} automated 90-day notices. Awaiting manager sign-off logs."
+        return send_notices_message(self.count_notice_candidates())
+
+    def count_notice_candidates(self) -> int:
+        return sum(1 for renewal in self.renewals.values() if renewal.days_out >= 90)
+
+
+def assignment_activity(ticket: Ticket, vendor: Vendor) -> ActivityItem:
+    return ActivityItem(
+        text=f"AI-assisted assignment: {vendor.name} -> {ticket.ticket_id} ({ticket.unit})",
+        timestamp=datetime.now().strftime("%H:%M"),
+    )
+
+
+def bulk_process_message(ready: int) -> str:
+    return f"Processed {ready} renewal cases. Manager review queue updated."
+
 
+def send_notices_message(count: int) -> str:
+    return f"Sent {count} automated 90-day notices. Awaiting manager sign-off logs."
 
-store = MockStore()
-store.seed()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import math
+import secrets
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from fastapi import HTTPException, Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import AppConfig
+
+
+CLIENT_COOKIE = "hb_client"
+CLIENT_COOKIE_MAX_AGE = 365 * 24 * 3600
+
+
+def sign_client_id(client_id: str, secret: str) -> str:
+    digest = hmac.new(secret.encode("utf-8"), client_id.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+    return f"{client_id}.{digest}"
+
+
+def verify_client_id(cookie: str, secret: str) -> str | None:
+    # The client id part of a cookie this app issued, or None for a forged or foreign one.
+    client_id, _, _ = cookie.rpartition(".")
+    if client_id and hmac.compare_digest(sign_client_id(client_id, secret), cookie):
+        return client_id
+    return None
+
+
+@dataclass
+class TokenBucket:
+    tokens: float
+    updated_at: float
+
+
+@dataclass
+class PollLimiter:
+    rate_per_second: float = 1.0
+    burst: int = 10
+    max_inflight: int = 256
+    max_clients: int = 50_000
+    client_id_secret: str = field(default_factory=lambda: secrets.token_hex(32), repr=False)
+    buckets: dict[str, TokenBucket] = field(default_factory=dict)
+    inflight: int = 0
+    throttled: int = 0
+    shed: int = 0
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> PollLimiter:
+        return cls(
+            rate_per_second=config.poll_rate,
+            burst=config.poll_burst,
+            max_inflight=config.poll_max_inflight,
+            client_id_secret=config.client_id_secret,
+        )
+
+    def client_key(self, request: Request) -> str:
+        # Browsers get an hb_client cookie from ClientIdMiddleware, so users behind one NAT
+        # or office proxy get separate buckets. Requests without it fall back to the peer
+        # address; behind a reverse proxy that is the proxy itself unless uvicorn runs with
+        # --proxy-headers --forwarded-allow-ips=<proxy address>, which takes the client
+        # from X-Forwarded-For. A freshly issued cookie is not used until the client sends
+        # it back, so clients that drop cookies are still limited by address. The cookie is
+        # signed: a made-up value counts as no cookie, so minting ids buys no extra burst.
+        client_id = verify_client_id(request.cookies.get(CLIENT_COOKIE, ""), self.client_id_secret)
+        if client_id:
+            return f"cookie:{client_id}"
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    def take(self, client: str, now: float | None = None) -> float:
+        # Returns 0 when a token was consumed, otherwise the seconds until one is available.
+        now = time.monotonic() if now is None else now
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            if len(self.buckets) >= self.max_clients:
+                self._prune(now)
+            bucket = self.buckets[client] = TokenBucket(tokens=float(self.burst), updated_at=now)
+        else:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated_at) * self.rate_per_second)
+            bucket.updated_at = now
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return 0.0
+        return (1 - bucket.tokens) / self.rate_per_second
+
+    def _prune(self, now: float) -> None:
+        # Drop buckets that have refilled completely; they behave exactly like a new client.
+        refill_seconds = self.burst / self.rate_per_second
+        for client in [key for key, bucket in self.buckets.items() if now - bucket.updated_at >= refill_seconds]:
+            del self.buckets[client]
+
+
+class ClientIdMiddleware:
+    # Issues a signed hb_client cookie to a client that has none, or one that doesn't verify.
+    def __init__(self, app: ASGIApp, secret: str) -> None:
+        self.app = app
+        self.secret = secret
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or verify_client_id(Request(scope).cookies.get(CLIENT_COOKIE, ""), self.secret):
+            await self.app(scope, receive, send)
+            return
+        value = sign_client_id(secrets.token_urlsafe(16), self.secret)
+        cookie = (
+            f"{CLIENT_COOKIE}={value}; Path=/; Max-Age={CLIENT_COOKIE_MAX_AGE}; HttpOnly; SameSite=Lax"
+        ).encode("latin-1")
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie)]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def _backoff(retry_after: float, reason: str) -> HTTPException:
+    seconds = max(1, math.ceil(retry_after))
+    return HTTPException(
+        status_code=429,
+        detail=reason,
+        headers={
+            "Retry-After": str(seconds),
+            "HX-Trigger": json.dumps({"poll-backoff": {"retryAfter": seconds, "reason": reason}}),
+        },
+    )
+
+
+async def poll_guard(request: Request) -> AsyncIterator[None]:
+    # Dependency for polling partials only; interactive POSTs never wait behind it.
+    poll_limiter: PollLimiter = request.app.state.services.poll_limiter
+    if poll_limiter.inflight >= poll_limiter.max_inflight:
+        poll_limiter.shed += 1
+        raise _backoff(1 + poll_limiter.inflight / max(1, poll_limiter.max_inflight), "overloaded")
+    retry_after = poll_limiter.take(poll_limiter.client_key(request))
+    if retry_after:
+        poll_limiter.throttled += 1
+        raise _backoff(retry_after, "rate_limited")
+    poll_limiter.inflight += 1
+    try:
+        yield
+    finally:
+        poll_limiter.inflight -= 1
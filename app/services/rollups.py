@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, NamedTuple
+
+from app.services.mock_store import ActivityItem, MockStore, RenewalCase, Ticket
+
+
+class _TicketContribution(NamedTuple):
+    status: str
+    priority: str
+    area: str
+    open: bool
+    breached: bool
+
+
+class _RenewalContribution(NamedTuple):
+    stage: str
+    ai_status: str
+
+
+def _ticket_contribution(ticket: Ticket) -> _TicketContribution:
+    is_open = ticket.status_index < len(ticket.statuses) - 1
+    return _TicketContribution(
+        status=ticket.statuses[ticket.status_index],
+        priority=ticket.priority,
+        area=ticket.area,
+        open=is_open,
+        breached=is_open and ticket.sla_minutes_remaining <= 0,
+    )
+
+
+# Hourly action buckets older than this are dropped when a new day starts.
+HOURLY_RETENTION_DAYS = 7
+
+
+def _activity_hour(item: ActivityItem) -> str:
+    return f"{item.date} {item.timestamp.split(':', 1)[0]}:00"
+
+
+@dataclass
+class PortfolioRollups:
+    open_by_status: Counter[str] = field(default_factory=Counter)
+    open_by_priority: Counter[str] = field(default_factory=Counter)
+    open_by_area: Counter[str] = field(default_factory=Counter)
+    renewals_by_stage: Counter[str] = field(default_factory=Counter)
+    renewals_by_ai_status: Counter[str] = field(default_factory=Counter)
+    # "YYYY-MM-DD HH:00" -> actions, and "YYYY-MM-DD" -> actions.
+    actions_by_hour: Counter[str] = field(default_factory=Counter)
+    actions_by_day: Counter[str] = field(default_factory=Counter)
+    open_tickets: int = 0
+    sla_breaches: int = 0
+    total_renewals: int = 0
+    actions_total: int = 0
+    _tickets: dict[str, _TicketContribution] = field(default_factory=dict, repr=False)
+    _renewals: dict[str, _RenewalContribution] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_store(cls, source: MockStore) -> PortfolioRollups:
+        rollups = cls()
+        rollups.rebuild(source)
+        source.subscribe(rollups.on_store_event)
+        return rollups
+
+    def rebuild(self, source: MockStore) -> None:
+        for counter in (
+            self.open_by_status,
+            self.open_by_priority,
+            self.open_by_area,
+            self.renewals_by_stage,
+            self.renewals_by_ai_status,
+            self.actions_by_hour,
+            self.actions_by_day,
+        ):
+            counter.clear()
+        self._tickets.clear()
+        self._renewals.clear()
+        self.open_tickets = self.sla_breaches = self.total_renewals = self.actions_total = 0
+        for ticket_id, ticket in source.tickets.items():
+            self._apply_ticket(ticket_id, ticket)
+        for unit_id, renewal in source.renewals.items():
+            self._apply_renewal(unit_id, renewal)
+        for item in source.activity_log:
+            self._apply_activity(item)
+
+    def on_store_event(self, kind: str, key: str | None, entity: Any) -> None:
+        if kind == "reset":
+            self.rebuild(entity)
+        elif kind == "ticket" and key is not None:
+            self._apply_ticket(key, entity)
+        elif kind == "renewal" and key is not None:
+            self._apply_renewal(key, entity)
+        elif kind == "activity":
+            self._apply_activity(entity)
+
+    @property
+    def pending_renewals(self) -> int:
+        return self.total_renewals - self.renewals_by_ai_status["Sent to tenant"]
+
+    @property
+    def actions_today(self) -> int:
+        # Keyed by date, so the count starts from zero at midnight without a reset.
+        return self.actions_by_day[date.today().isoformat()]
+
+    def counts(self) -> dict[str, Any]:
+        # Plain-dict view shared by the in-process dashboard and shard scatter-gather.
+        return {
+            "open_tickets": self.open_tickets,
+            "sla_breaches": self.sla_breaches,
+            "total_renewals": self.total_renewals,
+            "pending_renewals": self.pending_renewals,
+            "actions_total": self.actions_total,
+            "actions_today": self.actions_today,
+            "open_by_status": dict(self.open_by_status),
+            "open_by_priority": dict(self.open_by_priority),
+            "open_by_area": dict(self.open_by_area),
+            "renewals_by_stage": dict(self.renewals_by_stage),
+            "renewals_by_ai_status": dict(self.renewals_by_ai_status),
+            "actions_by_hour": dict(self.actions_by_hour),
+        }
+
+    def _apply_ticket(self, ticket_id: str, ticket: Ticket) -> None:
+        current = _ticket_contribution(ticket)
+        previous = self._tickets.get(ticket_id)
+        if previous == current:
+            return
+        if previous is not None:
+            self._count_ticket(previous, -1)
+        self._count_ticket(current, 1)
+        self._tickets[ticket_id] = current
+
+    def _count_ticket(self, contribution: _TicketContribution, delta: int) -> None:
+        if not contribution.open:
+            return
+        self.open_tickets += delta
+        self.sla_breaches += delta if contribution.breached else 0
+        for counter, value in (
+            (self.open_by_status, contribution.status),
+            (self.open_by_priority, contribution.priority),
+            (self.open_by_area, contribution.area),
+        ):
+            counter[value] += delta
+            if counter[value] <= 0:
+                del counter[value]
+
+    def _apply_renewal(self, unit_id: str, renewal: RenewalCase) -> None:
+        current = _RenewalContribution(stage=renewal.stage, ai_status=renewal.ai_status)
+        previous = self._renewals.get(unit_id)
+        if previous == current:
+            return
+        if previous is None:
+            self.total_renewals += 1
+        else:
+            self._count_renewal(previous, -1)
+        self._count_renewal(current, 1)
+        self._renewals[unit_id] = current
+
+    def _count_renewal(self, contribution: _RenewalContribution, delta: int) -> None:
+        for counter, value in (
+            (self.renewals_by_stage, contribution.stage),
+            (self.renewals_by_ai_status, contribution.ai_status),
+        ):
+            counter[value] += delta
+            if counter[value] <= 0:
+                del counter[value]
+
+    def _apply_activity(self, item: ActivityItem) -> None:
+        if item.date not in self.actions_by_day:
+            self._roll_over(item.date)
+        self.actions_by_day[item.date] += 1
+        self.actions_by_hour[_activity_hour(item)] += 1
+        self.actions_total += 1
+
+    def _roll_over(self, day: str) -> None:
+        # Daily totals are small and kept; hourly buckets only for the recent window.
+        cutoff = (date.fromisoformat(day) - timedelta(days=HOURLY_RETENTION_DAYS)).isoformat()
+        for hour in [hour for hour in self.actions_by_hour if hour < cutoff]:
+            del self.actions_by_hour[hour]
+
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import gc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import AppConfig
+from app.services.coalesce import SingleFlight
+from app.services.contract_batch import DocumentBatchRunner
+from app.services.intake import IntakePipeline
+from app.services.journal import MutationJournal
+from app.services.mock_store import FetchKey, MockStore
+from app.services.rate_limit import PollLimiter
+from app.services.rollups import PortfolioRollups
+from app.services.search import DEFAULT_LIMIT, SearchDocument, SearchIndex
+from app.services.sharding import ShardedStore
+from app.services.sync import ChangeFeed
+from app.services.vendor_ranking import VendorRanking
+
+
+T = TypeVar("T")
+
+# Fetch kinds answered from the app's indexes rather than the store's collections.
+_DERIVED_KINDS = {"dashboard_counts", "vendor_shortlist"}
+
+
+@dataclass
+class Services:
+    # Everything built from the store for one app instance. The in-process indexes
+    # only exist for the memory backend; the sharded backend answers from its shards.
+    config: AppConfig
+    store: MockStore | ShardedStore
+    search_index: SearchIndex | None = None
+    rollups: PortfolioRollups | None = None
+    change_feed: ChangeFeed | None = None
+    intake: IntakePipeline | None = None
+    journal: MutationJournal | None = None
+    vendor_ranking: VendorRanking | None = None
+    documents: DocumentBatchRunner | None = None
+    # Request guards are per app too, so two apps in one process never share limits.
+    poll_limiter: PollLimiter = field(default_factory=PollLimiter)
+    single_flight: SingleFlight = field(default_factory=SingleFlight)
+
+    @property
+    def local_store(self) -> MockStore:
+        if not isinstance(self.store, MockStore):
+            raise HTTPException(status_code=503, detail="Not available with the sharded store backend")
+        return self.store
+
+    async def call(self, method: Callable[..., T], *args: Any) -> T:
+        # Same rule as StoreLoader: blocking backends are called off the event loop.
+        if getattr(self.store, "blocking", True):
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list[SearchDocument]:
+        if self.search_index is not None:
+            return self.search_index.search(query, limit)
+        return self.store.search(query, limit)
+
+    def fetch_many(self, keys: list[FetchKey]) -> list[Any]:
+        # StoreLoader backend: derived kinds are answered in the same call as the store
+        # reads. The sharded store answers them from its shards.
+        if self.rollups is None or self.vendor_ranking is None:
+            return self.store.fetch_many(keys)
+        store = self.local_store
+        stored = iter(store.fetch_many([key for key in keys if key[0] not in _DERIVED_KINDS]))
+        results: list[Any] = []
+        for kind, *args in keys:
+            if kind == "dashboard_counts":
+                results.append(self.rollups.counts())
+            elif kind == "vendor_shortlist":
+                ticket = store.tickets.get(args[0])
+                if ticket is None:
+                    results.append(KeyError(args[0]))
+                else:
+                    results.append(self.vendor_ranking.shortlist_for_ticket(ticket))
+            else:
+                results.append(next(stored))
+        return results
+
+    def close(self) -> None:
+        if self.intake is not None:
+            self.intake.close()
+        if self.documents is not None:
+            self.documents.close()
+        if self.journal is not None:
+            self.journal.close()
+        if isinstance(self.store, ShardedStore):
+            self.store.close()
+
+
+def build_services(config: AppConfig) -> Services:
+    # Seeding and journal restore allocate the whole store at once and none of it is
+    # garbage: pause the cyclic collector while loading. The heap is not frozen, since
+    # the store and its listeners form a cycle that must stay collectable once the app
+    # is closed; several apps can be built and closed in one process.
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        return _build_services(config)
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def _build_services(config: AppConfig) -> Services:
+    source = MockStore()
+    source.seed()
+    if config.seed_size:
+        source.seed_synthetic(config.seed_size)
+
+    if config.store_backend == "sharded":
+        return Services(
+            config=config,
+            store=ShardedStore.start(source, config.shard_count, processes=config.shard_processes),
+            poll_limiter=PollLimiter.from_config(config),
+            single_flight=SingleFlight(enabled=config.coalesce_polls),
+        )
+
+    # The journal restores before the indexes are built so they start from the recovered state.
+    journal = (
+        MutationJournal.open(source, config.journal_dir, snapshot_every=config.snapshot_every)
+        if config.journal_dir
+        else None
+    )
+    return Services(
+        config=config,
+        store=source,
+        search_index=SearchIndex.from_store(source),
+        rollups=PortfolioRollups.from_store(source),
+        change_feed=ChangeFeed.from_store(source),
+        intake=IntakePipeline.from_store(source),
+        journal=journal,
+        vendor_ranking=VendorRanking.from_store(source),
+        documents=DocumentBatchRunner(output_dir=Path(config.documents_dir)),
+        poll_limiter=PollLimiter.from_config(config),
+        single_flight=SingleFlight(enabled=config.coalesce_polls),
+    )
+
+
+def get_services(request: Request) -> Services:
+    services: Services | None = getattr(request.app.state, "services", None)
+    if services is None:
+        raise RuntimeError("App services are not started; run the app through its lifespan")
+    return services
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import re
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Iterator
+
+from app.services.mock_store import MockStore, RenewalCase, Ticket, Vendor
+
+
+_DIACRITICS = re.compile("[\u0610-\u061a\u0640\u064b-\u065f\u0670\u06d6-\u06ed]")
+_TOKEN_SPLIT = re.compile(r"[^\w]+")
+_ARABIC_FOLDS = str.maketrans(
+    {
+        "أ": "ا",
+        "إ": "ا",
+        "آ": "ا",
+        "ٱ": "ا",
+        "ى": "ي",
+        "ئ": "ي",
+        "ؤ": "و",
+        "ة": "ه",
+    }
+)
+
+MIN_PREFIX_LENGTH = 1
+# Every term but the last is a finished word. One shorter than this matches only that exact
+# token, not every token it prefixes: "a b c" would otherwise intersect most of the index.
+MIN_INNER_PREFIX_LENGTH = 2
+DEFAULT_LIMIT = 8
+# Multi-term queries scan at most this many driver documents per requested result
+# before switching from the lazy scan to posting-set intersection.
+SCAN_BUDGET_PER_RESULT = 64
+
+DocKey = tuple[str, str]
+
+
+def normalize_text(value: str) -> str:
+    return _DIACRITICS.sub("", value.casefold()).translate(_ARABIC_FOLDS)
+
+
+def tokenize(value: str) -> list[str]:
+    return [token for token in _TOKEN_SPLIT.split(normalize_text(value)) if token]
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    kind: str
+    doc_id: str
+    title: str
+    subtitle: str
+    href: str
+
+
+@dataclass
+class SearchIndex:
+    postings: dict[str, set[DocKey]] = field(default_factory=dict)
+    vocabulary: list[str] = field(default_factory=list)
+    documents: dict[DocKey, SearchDocument] = field(default_factory=dict)
+    doc_tokens: dict[DocKey, frozenset[str]] = field(default_factory=dict)
+    _bulk_loading: bool = field(default=False, repr=False)
+
+    @classmethod
+    def from_store(cls, source: MockStore) -> SearchIndex:
+        index = cls()
+        index.rebuild(source)
+        source.subscribe(index.on_store_event)
+        return index
+
+    def rebuild(self, source: MockStore) -> None:
+        self.postings.clear()
+        self.documents.clear()
+        self.doc_tokens.clear()
+        self._bulk_loading = True
+        try:
+            for ticket_id, ticket in source.tickets.items():
+                self._index_ticket(ticket_id, ticket)
+            for vendor_id, vendor in source.vendors.items():
+                self._index_vendor(vendor_id, vendor)
+            for unit_id, renewal in source.renewals.items():
+                self._index_renewal(unit_id, renewal)
+        finally:
+            self._bulk_loading = False
+        self.vocabulary = sorted(self.postings)
+
+    def on_store_event(self, kind: str, key: str | None, entity: Any) -> None:
+        if kind == "reset":
+            self.rebuild(entity)
+        elif kind == "ticket" and key is not None:
+            self._index_ticket(key, entity)
+        elif kind == "vendor" and key is not None:
+            self._index_vendor(key, entity)
+        elif kind == "renewal" and key is not None:
+            self._index_renewal(key, entity)
+
+    def upsert(self, document: SearchDocument, text: str) -> None:
+        key = (document.kind, document.doc_id)
+        tokens = frozenset(tokenize(text))
+        previous = self.doc_tokens.get(key, frozenset())
+        for token in previous - tokens:
+            self._unpost(token, key)
+        for token in tokens - previous:
+            self._post(token, key)
+        self.documents[key] = document
+        self.doc_tokens[key] = tokens
+
+    def remove(self, kind: str, doc_id: str) -> None:
+        key = (kind, doc_id)
+        for token in self.doc_tokens.pop(key, frozenset()):
+            self._unpost(token, key)
+        self.documents.pop(key, None)
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list[SearchDocument]:
+        terms = [term for term in dict.fromkeys(tokenize(query)) if len(term) >= MIN_PREFIX_LENGTH]
+        if not terms or limit <= 0:
+            return []
+
+        exact = {term for term in terms[:-1] if len(term) < MIN_INNER_PREFIX_LENGTH}
+        # Drive the scan from the most selective term and verify the rest against the
+        # forward index, so broad prefixes never materialize their full posting lists.
+        ranges = {term: self._token_range(term) if term in exact else self._prefix_range(term) for term in terms}
+        cap = limit * SCAN_BUDGET_PER_RESULT
+        estimates = {term: self._estimate(*ranges[term], cap=cap) for term in terms}
+        driver = min(terms, key=estimates.__getitem__)
+        others = [term for term in terms if term != driver]
+
+        results: list[SearchDocument] = []
+        seen: set[DocKey] = set()
+        for key in self._iter_prefix(*ranges[driver]):
+            if key in seen:
+                continue
+            if others and len(seen) >= cap:
+                # Common terms that rarely co-occur ("repair lock"): stop scanning and
+                # intersect the posting sets instead.
+                return self._search_by_intersection(ranges, limit)
+            seen.add(key)
+            tokens = self.doc_tokens[key]
+            if all(
+                term in tokens if term in exact else any(token.startswith(term) for token in tokens)
+                for term in others
+            ):
+                results.append(self.documents[key])
+                if len(results) >= limit:
+                    break
+        return results
+
+    def _search_by_intersection(self, ranges: dict[str, tuple[int, int]], limit: int) -> list[SearchDocument]:
+        # Exact counts, narrowest prefix first; a term stops counting once it can no
+        # longer be the smallest, which is all the ordering below needs.
+        counts: dict[str, int] = {}
+        smallest: int | None = None
+        for term, (start, end) in sorted(ranges.items(), key=lambda item: item[1][1] - item[1][0]):
+            counts[term] = self._estimate(start, end, cap=sys.maxsize if smallest is None else smallest + 1)
+            smallest = counts[term] if smallest is None else min(smallest, counts[term])
+
+        driver, *others = sorted(ranges, key=counts.__getitem__)
+        buckets = self._buckets(*ranges[driver])
+        matches = buckets[0] if len(buckets) == 1 else set().union(*buckets)
+        for term in others:
+            start, end = ranges[term]
+            if end - start <= len(matches):
+                matches = set().union(*(matches.intersection(bucket) for bucket in self._buckets(start, end)))
+            else:
+                # Very broad prefix ("a"): checking the few remaining candidates is cheaper.
+                tokens = frozenset(self.vocabulary[start:end])
+                matches = {key for key in matches if not tokens.isdisjoint(self.doc_tokens[key])}
+            if not matches:
+                return []
+        return [self.documents[key] for key in islice(matches, limit)]
+
+    def _post(self, token: str, key: DocKey) -> None:
+        bucket = self.postings.get(token)
+        if bucket is None:
+            self.postings[token] = {key}
+            if not self._bulk_loading:
+                self.vocabulary.insert(bisect_left(self.vocabulary, token), token)
+        else:
+            bucket.add(key)
+
+    def _unpost(self, token: str, key: DocKey) -> None:
+        bucket = self.postings.get(token)
+        if bucket is None:
+            return
+        bucket.discard(key)
+        if not bucket:
+            del self.postings[token]
+            if self._bulk_loading:
+                return
+            position = bisect_left(self.vocabulary, token)
+            if position < len(self.vocabulary) and self.vocabulary[position] == token:
+                del self.vocabulary[position]
+
+    def _prefix_range(self, prefix: str) -> tuple[int, int]:
+        start = bisect_left(self.vocabulary, prefix)
+        end = bisect_left(self.vocabulary, prefix + "\U0010ffff", lo=start)
+        return start, end
+
+    def _token_range(self, token: str) -> tuple[int, int]:
+        start = bisect_left(self.vocabulary, token)
+        found = start < len(self.vocabulary) and self.vocabulary[start] == token
+        return start, start + found
+
+    def _estimate(self, start: int, end: int, cap: int) -> int:
+        total = 0
+        for position in range(start, end):
+            total += len(self.postings[self.vocabulary[position]])
+            if total >= cap:
+                return cap
+        return total
+
+    def _buckets(self, start: int, end: int) -> list[set[DocKey]]:
+        return [self.postings[token] for token in self.vocabulary[start:end]]
+
+    def _iter_prefix(self, start: int, end: int) -> Iterator[DocKey]:
+        for position in range(start, end):
+            yield from self.postings[self.vocabulary[position]]
+
+    def _index_ticket(self, ticket_id: str, ticket: Ticket) -> None:
+        self.upsert(
+            SearchDocument(
+                kind="ticket",
+                doc_id=ticket_id,
+                title=f"{ticket.ticket_id} {ticket.title}",
+                subtitle=f"{ticket.unit} - {ticket.area} - {ticket.statuses[ticket.status_index]}",
+                href=f"/maintenance/ticket/{ticket_id}",
+            ),
+            " ".join(
+                (ticket.ticket_id, ticket.title, ticket.unit, ticket.area, ticket.tenant_name, ticket.vendor_name)
+            ),
+        )
+
+    def _index_vendor(self, vendor_id: str, vendor: Vendor) -> None:
+        self.upsert(
+            SearchDocument(
+                kind="vendor",
+                doc_id=vendor_id,
+                title=vendor.name,
+                subtitle=f"{vendor.specialty} - {vendor.area} - {vendor.availability}",
+                href="/vendors/compliance",
+            ),
+            " ".join((vendor.vendor_id, vendor.name, vendor.specialty, vendor.area)),
+        )
+
+    def _index_renewal(self, unit_id: str, renewal: RenewalCase) -> None:
+        self.upsert(
+            SearchDocument(
+                kind="unit",
+                doc_id=unit_id,
+                title=renewal.unit,
+                subtitle=f"{renewal.area} - {renewal.stage} - {renewal.ai_status}",
+                href=f"/renewals/rera/{unit_id}",
+            ),
+            " ".join((unit_id, renewal.unit, renewal.area, renewal.bedrooms)),
+        )
+        self.upsert(
+            SearchDocument(
+                kind="tenant",
+                doc_id=unit_id,
+                title=renewal.tenant_name,
+                subtitle=f"{renewal.unit} - {renewal.area}",
+                href=f"/renewals/communication/{unit_id}",
+            ),
+            " ".join((renewal.tenant_name, renewal.unit, renewal.area)),
+        )
+
@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from typing import Any, ClassVar, Protocol
+
+from app.services.mock_store import (
+    AgentState,
+    ActivityItem,
+    ComplianceRecord,
+    ContractDraft,
+    FetchKey,
+    MockStore,
+    RenewalCase,
+    ReraAnalysis,
+    Ticket,
+    Vendor,
+    assignment_activity,
+    bulk_process_message,
+    send_notices_message,
+)
+from app.services.intake import ticket_category
+from app.services.rollups import PortfolioRollups
+from app.services.search import DEFAULT_LIMIT, SearchDocument, SearchIndex
+from app.services.vendor_ranking import DEFAULT_SHORTLIST, RankedVendor, VendorRanking
+
+
+# Sub-areas that belong to the same managed portfolio and therefore the same shard.
+AREA_PORTFOLIOS: dict[str, str] = {
+    "Al Barsha South": "Al Barsha",
+}
+
+ShardCall = tuple[str, tuple[Any, ...]]
+
+_ROUTED_KINDS = {"ticket": "tickets", "renewal": "renewals", "rera": "renewals", "contract": "renewals"}
+_SCATTER_KINDS = {"vendors", "compliance", "renewal_buckets"}
+_COORDINATOR_KINDS = {"agent_state", "activity"}
+_HANDLER_METHODS = {"dashboard_counts", "search", "vendor_shortlist"}
+
+
+class ShardUnavailable(RuntimeError):
+    # A shard process has exited or its pipe is broken; its partition cannot be served.
+    def __init__(self, shards: list[int]) -> None:
+        super().__init__(f"Store shard(s) unavailable: {', '.join(map(str, shards))}")
+        self.shards = shards
+
+
+def portfolio_of(area: str) -> str:
+    return AREA_PORTFOLIOS.get(area, area)
+
+
+def assign_portfolios(source: MockStore, shard_count: int) -> dict[str, int]:
+    # Portfolios are few and uneven, so hashing them leaves shards empty. Place the largest
+    # portfolio first, each on the shard holding the fewest entities so far.
+    sizes: Counter[str] = Counter()
+    for areas in (
+        (ticket.area for ticket in source.tickets.values()),
+        (vendor.area for vendor in source.vendors.values()),
+        (renewal.area for renewal in source.renewals.values()),
+    ):
+        sizes.update(map(portfolio_of, areas))
+    loads = [0] * shard_count
+    assignment: dict[str, int] = {}
+    for portfolio, size in sorted(sizes.items(), key=lambda item: (-item[1], item[0])):
+        index = loads.index(min(loads))
+        assignment[portfolio] = index
+        loads[index] += size
+    return assignment
+
+
+def partition_store(source: MockStore, assignment: dict[str, int], shard_count: int) -> list[MockStore]:
+    shards = [MockStore() for _ in range(shard_count)]
+
+    def shard_for(area: str) -> MockStore:
+        # Records whose area is unknown (a contract without a renewal, ...) go to the first shard.
+        return shards[assignment.get(portfolio_of(area), 0)]
+
+    vendor_areas = {vendor.name: vendor.area for vendor in source.vendors.values()}
+    unit_areas = {renewal.unit: renewal.area for renewal in source.renewals.values()}
+    for ticket_id, ticket in source.tickets.items():
+        shard_for(ticket.area).tickets[ticket_id] = ticket
+    for vendor_id, vendor in source.vendors.items():
+        shard_for(vendor.area).vendors[vendor_id] = vendor
+    for unit_id, renewal in source.renewals.items():
+        shard_for(renewal.area).renewals[unit_id] = renewal
+    for unit_id, contract in source.contracts.items():
+        area = source.renewals[unit_id].area if unit_id in source.renewals else ""
+        shard_for(area).contracts[unit_id] = contract
+    for record in source.compliance:
+        shard_for(vendor_areas.get(record.vendor_name, "")).compliance.append(record)
+    for schedule in source.cheque_schedules:
+        shard_for(unit_areas.get(schedule.unit, "")).cheque_schedules.append(schedule)
+    return shards
+
+
+class ShardHandler:
+    # Runs inside the shard: store methods plus shard-local rollups, search and vendor ranking.
+    def __init__(self, shard: MockStore) -> None:
+        self.store = shard
+        self.rollups = PortfolioRollups.from_store(shard)
+        self.search_index = SearchIndex.from_store(shard)
+        self.vendor_ranking = VendorRanking.from_store(shard)
+
+    def execute(self, calls: list[ShardCall]) -> list[Any]:
+        results: list[Any] = []
+        for method, args in calls:
+            target = self if method in _HANDLER_METHODS else self.store
+            try:
+                results.append(getattr(target, method)(*args))
+            except Exception as exc:
+                # One failing call must not take the shard down; the caller re-raises it.
+                results.append(exc)
+        return results
+
+    def dashboard_counts(self) -> dict[str, Any]:
+        return self.rollups.counts()
+
+    def search(self, query: str, limit: int) -> list[SearchDocument]:
+        return self.search_index.search(query, limit)
+
+    def vendor_shortlist(self, specialty: str, area: str, limit: int) -> list[RankedVendor]:
+        return self.vendor_ranking.shortlist(specialty, area, limit)
+
+
+class Shard(Protocol):
+    @property
+    def alive(self) -> bool: ...
+
+    def send(self, calls: list[ShardCall]) -> None: ...
+
+    def receive(self) -> list[Any]: ...
+
+    def close(self) -> None: ...
+
+
+@dataclass
+class LocalShard:
+    handler: ShardHandler
+    alive: bool = True
+    _pending: list[Any] = field(default_factory=list)
+
+    def send(self, calls: list[ShardCall]) -> None:
+        self._pending = self.handler.execute(calls)
+
+    def receive(self) -> list[Any]:
+        results, self._pending = self._pending, []
+        return results
+
+    def close(self) -> None:
+        return None
+
+
+def _serve_shard(conn: Connection, shard: MockStore) -> None:
+    handler = ShardHandler(shard)
+    while True:
+        calls = conn.recv()
+        if calls is None:
+            break
+        results = handler.execute(calls)
+        try:
+            conn.send(results)
+        except Exception:
+            # An exception that doesn't pickle is sent back as its description instead.
+            conn.send([RuntimeError(repr(result)) if isinstance(result, Exception) else result for result in results])
+    conn.close()
+
+
+class ProcessShard:
+    def __init__(self, shard: MockStore) -> None:
+        context = multiprocessing.get_context()
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve_shard, args=(child_conn, shard), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def send(self, calls: list[ShardCall]) -> None:
+        self.conn.send(calls)
+
+    def receive(self) -> list[Any]:
+        return self.conn.recv()
+
+    def close(self) -> None:
+        if self.process.is_alive():
+            self.conn.send(None)
+            self.process.join(timeout=5)
+        self.conn.close()
+
+
+@dataclass
+class ShardedStore:
+    # Shards do real IPC, so request loaders call fetch_many from the thread pool.
+    blocking: ClassVar[bool] = True
+
+    shards: list[Shard]
+    coordinator: MockStore
+    directory: dict[str, dict[str, int]]
+    coordinator_rollups: PortfolioRollups | None = None
+    _locks: list[threading.Lock] = field(default_factory=list, repr=False)
+
+    @classmethod
+    def start(cls, source: MockStore, shard_count: int, processes: bool = True) -> ShardedStore:
+        assignment = assign_portfolios(source, shard_count)
+        partitions = partition_store(source, assignment, shard_count)
+        directory: dict[str, dict[str, int]] = {"tickets": {}, "vendors": {}, "renewals": {}}
+        for index, partition in enumerate(partitions):
+            for collection, owners in directory.items():
+                owners.update(dict.fromkeys(getattr(partition, collection), index))
+        directory["portfolios"] = assignment
+        # Agent status and the activity feed are portfolio-wide, so they stay on the router.
+        coordinator = MockStore(activity_log=list(source.activity_log))
+        shards: list[Shard] = [
+            ProcessShard(partition) if processes else LocalShard(ShardHandler(partition)) for partition in partitions
+        ]
+        return cls(shards=shards, coordinator=coordinator, directory=directory)
+
+    def __post_init__(self) -> None:
+        self._locks = [threading.Lock() for _ in self.shards]
+        if self.coordinator_rollups is None:
+            # Agent action counts come from the coordinator's activity feed.
+            self.coordinator_rollups = PortfolioRollups.from_store(self.coordinator)
+
+    def close(self) -> None:
+        for shard in self.shards:
+            shard.close()
+
+    def shard_sizes(self) -> list[int]:
+        # Tickets, vendors and renewals owned by each shard.
+        sizes = [0] * len(self.shards)
+        for collection in ("tickets", "vendors", "renewals"):
+            for index in self.directory[collection].values():
+                sizes[index] += 1
+        return sizes
+
+    def dead_shards(self) -> list[int]:
+        return [index for index, shard in enumerate(self.shards) if not shard.alive]
+
+    def scatter(self, calls_by_shard: dict[int, list[ShardCall]]) -> dict[int, list[Any]]:
+        # Send every shard its batch before reading any reply so the shards work in parallel.
+        targets = sorted(calls_by_shard)
+        for index in targets:
+            self._locks[index].acquire()
+        try:
+            sent: list[int] = []
+            dead: list[int] = []
+            for index in targets:
+                try:
+                    self.shards[index].send(calls_by_shard[index])
+                    sent.append(index)
+                except OSError:
+                    dead.append(index)
+            # Every shard that got a batch is read even if another one failed, so no reply
+            # is left in a pipe to be mistaken for the answer to the next batch.
+            replies: dict[int, list[Any]] = {}
+            for index in sent:
+                try:
+                    replies[index] = self.shards[index].receive()
+                except (EOFError, OSError):
+                    dead.append(index)
+            if dead:
+                raise ShardUnavailable(sorted(dead))
+            return replies
+        finally:
+            for index in targets:
+                self._locks[index].release()
+
+    def broadcast(self, method: str, *args: Any) -> list[Any]:
+        replies = self.scatter({index: [(method, args)] for index in range(len(self.shards))})
+        return [_unwrap(replies[index][0]) for index in range(len(self.shards))]
+
+    def route(self, collection: str, key: str, method: str, *args: Any) -> Any:
+        index = self._owner(collection, key)
+        return _unwrap(self.scatter({index: [(method, args)]})[index][0])
+
+    def _owner(self, collection: str, key: str) -> int:
+        try:
+            return self.directory[collection][key]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get_agent_state(self) -> AgentState:
+        return self.coordinator.get_agent_state()
+
+    def get_activity_slice(self, limit: int = 3) -> list[ActivityItem]:
+        return self.coordinator.get_activity_slice(limit)
+
+    def get_ticket(self, ticket_id: str) -> Ticket:
+        return self.route("tickets", ticket_id, "get_ticket", ticket_id)
+
+    def get_renewal(self, unit_id: str) -> RenewalCase:
+        return self.route("renewals", unit_id, "get_renewal", unit_id)
+
+    def get_contract(self, unit_id: str) -> ContractDraft:
+        return self.route("renewals", unit_id, "get_contract", unit_id)
+
+    def calculate_rera(self, unit_id: str, proposed_rent_aed: int) -> ReraAnalysis:
+        return self.route("renewals", unit_id, "calculate_rera", unit_id, proposed_rent_aed)
+
+    def advance_ticket(self, ticket_id: str) -> Ticket:
+        return self.route("tickets", ticket_id, "advance_ticket", ticket_id)
+
+    def get_vendors(self) -> list[Vendor]:
+        return [vendor for part in self.broadcast("get_vendors") for vendor in part]
+
+    def get_compliance(self) -> list[ComplianceRecord]:
+        return [record for part in self.broadcast("get_compliance") for record in part]
+
+    def get_renewals_by_stage(self) -> dict[str, list[RenewalCase]]:
+        return _merge_buckets(self.broadcast("get_renewals_by_stage"))
+
+    def assign_vendor(self, ticket_id: str, vendor_id: str) -> tuple[Ticket, Vendor]:
+        self._owner("tickets", ticket_id)
+        vendor = self.route("vendors", vendor_id, "reserve_vendor", vendor_id)
+        ticket = self.route("tickets", ticket_id, "attach_vendor", ticket_id, vendor.name)
+        self.coordinator.record_activity(assignment_activity(ticket, vendor))
+        return ticket, vendor
+
+    def vendor_shortlist(self, specialty: str, area: str, limit: int = DEFAULT_SHORTLIST) -> list[RankedVendor]:
+        # Vendors are partitioned by area, so every shard offers its own top-k for the ticket's area.
+        return _merge_shortlists(self.broadcast("vendor_shortlist", specialty, area, limit), limit)
+
+    def bulk_process_renewals(self) -> str:
+        return bulk_process_message(sum(self.broadcast("mark_offers_ready")))
+
+    def send_notices(self) -> str:
+        return send_notices_message(sum(self.broadcast("count_notice_candidates")))
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list[SearchDocument]:
+        # Each shard returns its own best matches; the first `limit` across shards are kept.
+        return [document for part in self.broadcast("search", query, limit) for document in part][:limit]
+
+    def dashboard_counts(self) -> dict[str, Any]:
+        assert self.coordinator_rollups is not None
+        return _merge_counts([*self.broadcast("dashboard_counts"), self.coordinator_rollups.counts()])
+
+    def fetch_many(self, keys: list[FetchKey]) -> list[Any]:
+        # Same contract as MockStore.fetch_many: one scatter round covers every shard the
+        # batch touches, and portfolio-wide kinds are merged from all of them. A vendor
+        # shortlist needs its ticket's category and area first, so it adds a second round.
+        shard_keys: dict[int, list[FetchKey]] = {}
+        handler_calls: dict[int, list[ShardCall]] = {}
+        plan: list[tuple[str, Any]] = []
+
+        def enqueue(index: int, key: FetchKey) -> tuple[int, int]:
+            bucket = shard_keys.setdefault(index, [])
+            bucket.append(key)
+            return index, len(bucket) - 1
+
+        def enqueue_call(index: int, call: ShardCall) -> tuple[int, int]:
+            bucket = handler_calls.setdefault(index, [])
+            bucket.append(call)
+            return index, len(bucket) - 1
+
+        for key in keys:
+            kind, *args = key
+            if kind in _COORDINATOR_KINDS:
+                plan.append(("value", self.coordinator.fetch_many([key])[0]))
+            elif kind in _ROUTED_KINDS:
+                owner = self.directory[_ROUTED_KINDS[kind]].get(args[0])
+                if owner is None:
+                    plan.append(("value", KeyError(args[0])))
+                else:
+                    plan.append(("routed", enqueue(owner, key)))
+            elif kind == "vendor_shortlist":
+                owner = self.directory["tickets"].get(args[0])
+                if owner is None:
+                    plan.append(("value", KeyError(args[0])))
+                else:
+                    plan.append((kind, enqueue(owner, ("ticket", args[0]))))
+            elif kind in _SCATTER_KINDS:
+                plan.append((kind, [enqueue(index, key) for index in range(len(self.shards))]))
+            elif kind == "dashboard_counts":
+                plan.append((kind, [enqueue_call(index, (kind, ())) for index in range(len(self.shards))]))
+            else:
+                raise KeyError(kind)
+
+        calls: dict[int, list[ShardCall]] = {}
+        for index in {*shard_keys, *handler_calls}:
+            batch = [("fetch_many", (shard_keys[index],))] if index in shard_keys else []
+            calls[index] = batch + handler_calls.get(index, [])
+        replies = self.scatter(calls)
+
+        def value(index: int, position: int) -> Any:
+            return _unwrap(replies[index][0])[position]
+
+        def call_value(index: int, position: int) -> Any:
+            # Handler calls follow the shard's store batch, when it has one.
+            return _unwrap(replies[index][position + (index in shard_keys)])
+
+        results: list[Any] = []
+        tickets: dict[int, Ticket] = {}
+        for mode, detail in plan:
+            if mode == "value":
+                results.append(detail)
+            elif mode == "routed":
+                results.append(value(*detail))
+            elif mode == "vendor_shortlist":
+                ticket = value(*detail)
+                if not isinstance(ticket, Exception):
+                    tickets[len(results)] = ticket
+                results.append(ticket)
+            elif mode == "dashboard_counts":
+                assert self.coordinator_rollups is not None
+                parts = [call_value(index, position) for index, position in detail]
+                results.append(_merge_counts([*parts, self.coordinator_rollups.counts()]))
+            else:
+                parts = [value(index, position) for index, position in detail]
+                if mode == "renewal_buckets":
+                    results.append(_merge_buckets(parts))
+                else:
+                    results.append([item for part in parts for item in part])
+
+        if tickets:
+            shortlist_calls: list[ShardCall] = [
+                ("vendor_shortlist", (ticket_category(ticket), ticket.area, DEFAULT_SHORTLIST))
+                for ticket in tickets.values()
+            ]
+            replies = self.scatter({index: shortlist_calls for index in range(len(self.shards))})
+            for position, slot in enumerate(tickets):
+                parts = [_unwrap(replies[index][position]) for index in range(len(self.shards))]
+                results[slot] = _merge_shortlists(parts, DEFAULT_SHORTLIST)
+        return results
+
+
+def _unwrap(result: Any) -> Any:
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def _merge_counts(parts: list[dict[str, Any]]) -> dict[str, Any]:
+    totals: dict[str, Any] = {}
+    for part in parts:
+        for name, value in part.items():
+            if isinstance(value, dict):
+                totals.setdefault(name, Counter()).update(value)
+            else:
+                totals[name] = totals.get(name, 0) + value
+    return totals
+
+
+def _merge_shortlists(parts: list[list[RankedVendor]], limit: int) -> list[RankedVendor]:
+    ranked = [candidate for part in parts for candidate in part]
+    ranked.sort(key=lambda candidate: candidate.score, reverse=True)
+    return ranked[:limit]
+
+
+def _merge_buckets(parts: list[dict[str, list[RenewalCase]]]) -> dict[str, list[RenewalCase]]:
+    merged: dict[str, list[RenewalCase]] = {}
+    for part in parts:
+        for stage, renewals in part.items():
+            merged.setdefault(stage, []).extend(renewals)
+    return merged
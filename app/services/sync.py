@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import secrets
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.mock_store import ActivityItem, MockStore, RenewalCase, Ticket
+
+
+# Positional field order for the compact encoding; sent to clients on full syncs only.
+TICKET_FIELDS = ("id", "title", "unit", "area", "status", "step", "steps", "sla", "priority", "vendor")
+RENEWAL_FIELDS = ("id", "unit", "tenant", "rent", "days_out", "stage", "ai_status", "area")
+ACTIVITY_FIELDS = ("text", "time")
+
+
+def encode_ticket(ticket_id: str, ticket: Ticket) -> list[Any]:
+    return [
+        ticket_id,
+        ticket.title,
+        ticket.unit,
+        ticket.area,
+        ticket.statuses[ticket.status_index],
+        ticket.status_index,
+        len(ticket.statuses),
+        ticket.sla_minutes_remaining,
+        ticket.priority,
+        ticket.vendor_name,
+    ]
+
+
+def encode_renewal(unit_id: str, renewal: RenewalCase) -> list[Any]:
+    return [
+        unit_id,
+        renewal.unit,
+        renewal.tenant_name,
+        renewal.current_rent_aed,
+        renewal.days_out,
+        renewal.stage,
+        renewal.ai_status,
+        renewal.area,
+    ]
+
+
+def encode_activity(item: ActivityItem) -> list[Any]:
+    return [item.text, item.timestamp]
+
+
+@dataclass
+class ChangeFeed:
+    activity_retention: int = 200
+    # Versions only count within one feed instance. A client holding a version from
+    # another epoch (a restart, another worker) gets a full sync instead of a delta.
+    epoch: str = field(default_factory=lambda: secrets.token_hex(8))
+    version: int = 0
+    reset_version: int = 0
+    # Entity keys in change order with the version of their latest change.
+    changes: OrderedDict[tuple[str, str], int] = field(default_factory=OrderedDict)
+    activity: deque[tuple[int, ActivityItem]] = field(default_factory=deque)
+    # Version of the newest activity entry dropped from the retained window. A client
+    # behind it would miss entries in a delta, so it gets a full sync.
+    activity_evicted: int = 0
+    _source: MockStore | None = field(default=None, repr=False)
+
+    @classmethod
+    def from_store(cls, source: MockStore) -> ChangeFeed:
+        feed = cls()
+        feed.on_store_event("reset", None, source)
+        source.subscribe(feed.on_store_event)
+        return feed
+
+    def on_store_event(self, kind: str, key: str | None, entity: Any) -> None:
+        self.version += 1
+        if kind == "reset":
+            self._source = entity
+            self.reset_version = self.version
+            self.changes.clear()
+            self.activity_evicted = 0
+            self.activity = deque(
+                ((self.version, item) for item in reversed(entity.activity_log[: self.activity_retention])),
+                maxlen=self.activity_retention,
+            )
+        elif kind == "activity":
+            if len(self.activity) == self.activity.maxlen:
+                self.activity_evicted = self.activity[0][0]
+            self.activity.append((self.version, entity))
+        elif key is not None and kind in ("ticket", "renewal"):
+            self.changes[(kind, key)] = self.version
+            self.changes.move_to_end((kind, key))
+
+    def is_current(self, since: int, epoch: str) -> bool:
+        return epoch == self.epoch and since == self.version
+
+    def delta(self, since: int, epoch: str) -> dict[str, Any]:
+        source = self._source
+        if source is None:
+            raise RuntimeError("Change feed is not attached to a store")
+        full = (
+            epoch != self.epoch
+            or since < self.reset_version
+            or since < self.activity_evicted
+            or since > self.version
+        )
+        payload: dict[str, Any] = {"v": self.version, "e": self.epoch}
+        if full:
+            payload["full"] = 1
+            payload["fields"] = {"t": TICKET_FIELDS, "r": RENEWAL_FIELDS, "a": ACTIVITY_FIELDS}
+            tickets = [encode_ticket(key, ticket) for key, ticket in source.tickets.items()]
+            renewals = [encode_renewal(key, renewal) for key, renewal in source.renewals.items()]
+            activity = [encode_activity(item) for _, item in reversed(self.activity)]
+        else:
+            tickets, renewals = [], []
+            for (kind, key), changed_at in reversed(self.changes.items()):
+                if changed_at <= since:
+                    break
+                if kind == "ticket":
+                    tickets.append(encode_ticket(key, source.tickets[key]))
+                else:
+                    renewals.append(encode_renewal(key, source.renewals[key]))
+            activity = []
+            for changed_at, item in reversed(self.activity):
+                if changed_at <= since:
+                    break
+                activity.append(encode_activity(item))
+        # Empty sections are omitted entirely to keep idle polls tiny.
+        for name, rows in (("t", tickets), ("r", renewals), ("a", activity)):
+            if rows:
+                payload[name] = rows
+        return payload
+
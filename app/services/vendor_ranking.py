@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import itertools
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from heapq import heapify, heappop, heappush
+from typing import Any
+
+from app.services.intake import ticket_category
+from app.services.mock_store import MockStore, Ticket, Vendor
+
+
+GENERALIST = "General"
+DEFAULT_SHORTLIST = 5
+
+# Approximate area centroids; tickets and units only carry an area, vendors carry coordinates.
+AREA_COORDINATES: dict[str, tuple[float, float]] = {
+    "Al Barsha": (25.1136, 55.1990),
+    "Al Barsha South": (25.0580, 55.2330),
+    "Dubai Marina": (25.0805, 55.1403),
+    "JBR": (25.0780, 55.1340),
+    "Business Bay": (25.1860, 55.2650),
+    "Downtown Dubai": (25.1972, 55.2744),
+    "Jumeirah": (25.2150, 55.2550),
+    "Deira": (25.2711, 55.3075),
+    "Al Nahda": (25.2920, 55.3720),
+}
+
+SCORE_WEIGHTS = {
+    "rating": 0.30,
+    "response": 0.20,
+    "distance": 0.20,
+    "workload": 0.15,
+    "experience": 0.15,
+}
+
+
+def distance_km(vendor: Vendor, area: str) -> float | None:
+    centroid = AREA_COORDINATES.get(area)
+    if centroid is None:
+        return None
+    lat1, lon1 = math.radians(vendor.latitude), math.radians(vendor.longitude)
+    lat2, lon2 = math.radians(centroid[0]), math.radians(centroid[1])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
+def compliance_factor(vendor: Vendor) -> float:
+    # 0 means the vendor cannot be dispatched at all; gaps short of that only demote.
+    if vendor.license_days_left <= 0:
+        return 0.0
+    factor = 1.0
+    if not vendor.insurance_valid:
+        factor *= 0.4
+    if not (vendor.emirates_id_verified and vendor.trade_license_verified):
+        factor *= 0.4
+    if vendor.license_days_left < 30:
+        factor *= 0.9
+    return factor
+
+
+def score_vendor(vendor: Vendor, specialty: str, area: str, open_jobs: int) -> float | None:
+    compliance = compliance_factor(vendor)
+    if compliance == 0 or (vendor.specialty != specialty and vendor.specialty != GENERALIST):
+        return None
+    distance = distance_km(vendor, area)
+    workload = 1 / (1 + open_jobs)
+    if vendor.availability == "busy":
+        workload *= 0.5
+    score = (
+        SCORE_WEIGHTS["rating"] * vendor.rating / 5
+        + SCORE_WEIGHTS["response"] / (1 + vendor.response_minutes / 60)
+        + SCORE_WEIGHTS["distance"] * (0.5 if distance is None else 1 / (1 + distance / 5))
+        + SCORE_WEIGHTS["workload"] * workload
+        + SCORE_WEIGHTS["experience"] * min(1.0, math.log1p(vendor.jobs_completed) / math.log1p(500))
+    )
+    if vendor.specialty != specialty:
+        # Generalists stay on every shortlist, behind comparable specialists.
+        score *= 0.9
+    return round(score * compliance, 6)
+
+
+@dataclass
+class RankedVendor:
+    vendor: Vendor
+    score: float
+    distance_km: float | None
+    open_jobs: int
+    compliance: float
+
+
+@dataclass
+class _Bucket:
+    # Lazy-deletion max-heap: superseded entries stay in the heap until popped or compacted.
+    heap: list[tuple[float, int, str]] = field(default_factory=list)
+    live: dict[str, tuple[float, int]] = field(default_factory=dict)
+    top: list[tuple[str, float]] | None = None
+
+
+@dataclass
+class VendorRanking:
+    k: int = DEFAULT_SHORTLIST
+    vendors: dict[str, Vendor] = field(default_factory=dict)
+    # Open tickets per vendor name, kept current from ticket events.
+    open_jobs: Counter[str] = field(default_factory=Counter)
+    buckets: dict[tuple[str, str], _Bucket] = field(default_factory=dict)
+    _ticket_vendors: dict[str, str] = field(default_factory=dict, repr=False)
+    _ids_by_name: dict[str, str] = field(default_factory=dict, repr=False)
+    _versions: itertools.count = field(default_factory=itertools.count, repr=False)
+
+    @classmethod
+    def from_store(cls, source: MockStore, k: int = DEFAULT_SHORTLIST) -> VendorRanking:
+        ranking = cls(k=k)
+        ranking.rebuild(source)
+        source.subscribe(ranking.on_store_event)
+        return ranking
+
+    def rebuild(self, source: MockStore) -> None:
+        self.vendors = dict(source.vendors)
+        self._ids_by_name = {vendor.name: vendor_id for vendor_id, vendor in self.vendors.items()}
+        self.open_jobs.clear()
+        self._ticket_vendors.clear()
+        for ticket_id, ticket in source.tickets.items():
+            self._track_ticket(ticket_id, ticket)
+        # Buckets are materialized again on first use.
+        self.buckets.clear()
+
+    def on_store_event(self, kind: str, key: str | None, entity: Any) -> None:
+        if kind == "reset":
+            self.rebuild(entity)
+        elif kind == "vendor" and key is not None:
+            previous = self.vendors.get(key)
+            if previous is not None and previous.name != entity.name:
+                self._ids_by_name.pop(previous.name, None)
+            self.vendors[key] = entity
+            self._ids_by_name[entity.name] = key
+            self._rescore(key)
+        elif kind == "ticket" and key is not None:
+            for name in self._track_ticket(key, entity):
+                vendor_id = self._ids_by_name.get(name)
+                if vendor_id is not None:
+                    self._rescore(vendor_id)
+
+    def shortlist(self, specialty: str, area: str, limit: int | None = None) -> list[RankedVendor]:
+        bucket = self.buckets.get((specialty, area))
+        if bucket is None:
+            bucket = self.buckets[(specialty, area)] = self._build_bucket(specialty, area)
+        if bucket.top is None:
+            bucket.top = self._top(bucket)
+        limit = self.k if limit is None else min(limit, self.k)
+        ranked: list[RankedVendor] = []
+        for vendor_id, score in bucket.top[:limit]:
+            vendor = self.vendors[vendor_id]
+            ranked.append(
+                RankedVendor(
+                    vendor=vendor,
+                    score=score,
+                    distance_km=distance_km(vendor, area),
+                    open_jobs=self.open_jobs[vendor.name],
+                    compliance=compliance_factor(vendor),
+                )
+            )
+        return ranked
+
+    def shortlist_for_ticket(self, ticket: Ticket, limit: int | None = None) -> list[RankedVendor]:
+        return self.shortlist(ticket_category(ticket), ticket.area, limit)
+
+    def _track_ticket(self, ticket_id: str, ticket: Ticket) -> list[str]:
+        # Returns the vendor names whose open-job count changed.
+        is_open = ticket.status_index < len(ticket.statuses) - 1
+        current = ticket.vendor_name if is_open and ticket.vendor_name in self._ids_by_name else None
+        previous = self._ticket_vendors.get(ticket_id)
+        if previous == current:
+            return []
+        changed: list[str] = []
+        if previous is not None:
+            del self._ticket_vendors[ticket_id]
+            self.open_jobs[previous] -= 1
+            if self.open_jobs[previous] <= 0:
+                del self.open_jobs[previous]
+            changed.append(previous)
+        if current is not None:
+            self._ticket_vendors[ticket_id] = current
+            self.open_jobs[current] += 1
+            changed.append(current)
+        return changed
+
+    def _build_bucket(self, specialty: str, area: str) -> _Bucket:
+        bucket = _Bucket()
+        for vendor_id, vendor in self.vendors.items():
+            score = score_vendor(vendor, specialty, area, self.open_jobs[vendor.name])
+            if score is not None:
+                version = next(self._versions)
+                bucket.live[vendor_id] = (score, version)
+                bucket.heap.append((-score, version, vendor_id))
+        heapify(bucket.heap)
+        return bucket
+
+    def _rescore(self, vendor_id: str) -> None:
+        vendor = self.vendors[vendor_id]
+        for (specialty, area), bucket in self.buckets.items():
+            score = score_vendor(vendor, specialty, area, self.open_jobs[vendor.name])
+            previous = bucket.live.pop(vendor_id, None)
+            if score is None and previous is None:
+                continue
+            if score is not None:
+                version = next(self._versions)
+                bucket.live[vendor_id] = (score, version)
+                heappush(bucket.heap, (-score, version, vendor_id))
+            top = bucket.top
+            if top is not None and (
+                any(ranked_id == vendor_id for ranked_id, _ in top)
+                or (score is not None and (len(top) < self.k or score > top[-1][1]))
+            ):
+                bucket.top = None
+            if len(bucket.heap) > 2 * len(bucket.live) + 64:
+                bucket.heap = [(-live, version, ranked_id) for ranked_id, (live, version) in bucket.live.items()]
+                heapify(bucket.heap)
+
+    def _top(self, bucket: _Bucket) -> list[tuple[str, float]]:
+        top: list[tuple[str, float]] = []
+        kept: list[tuple[float, int, str]] = []
+        while bucket.heap and len(top) < self.k:
+            entry = heappop(bucket.heap)
+            negative_score, version, vendor_id = entry
+            if bucket.live.get(vendor_id, (None, None))[1] != version:
+                continue
+            kept.append(entry)
+            top.append((vendor_id, -negative_score))
+        for entry in kept:
+            heappush(bucket.heap, entry)
+        return top
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import sys
+
+# Each sample runs in a fresh interpreter so imports, seeding and template compilation are all cold.
+CHILD = """
+import json, time
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.config import AppConfig
+from app.main import create_app
+imported = time.perf_counter()
+app = create_app(AppConfig(store_backend={backend!r}, seed_size={seed_size}, serve_static=False))
+created = time.perf_counter()
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    client.get("/dashboard").raise_for_status()
+    first = time.perf_counter()
+    client.get("/dashboard").raise_for_status()
+    second = time.perf_counter()
+print(json.dumps({{
+    "import": imported - started,
+    "create_app": created - imported,
+    "startup": ready - created,
+    "first_request": first - ready,
+    "warm_request": second - first,
+}}))
+"""
+PHASES = ("import", "create_app", "startup", "first_request", "warm_request")
+
+
+def sample(backend: str, seed_size: int) -> dict[str, float]:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD.format(backend=backend, seed_size=seed_size)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main(runs: int = 5, configs: tuple[tuple[str, int], ...] = (("memory", 0), ("memory", 100_000), ("sharded", 0))) -> None:
+    print(f"{'config':>16}  " + "  ".join(f"{phase:>13}" for phase in PHASES) + "  (median ms)")
+    for backend, seed_size in configs:
+        samples = [sample(backend, seed_size) for _ in range(runs)]
+        medians = [statistics.median(run[phase] for run in samples) * 1000 for phase in PHASES]
+        print(f"{backend + '/' + str(seed_size):>16}  " + "  ".join(f"{value:>13.1f}" for value in medians))
+
+
+if __name__ == "__main__":
+    main()
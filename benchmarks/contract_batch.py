@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+from app.services.contract_batch import generate_documents, select_cohort
+from benchmarks.search_index import build_store
+
+
+def main(renewals: int = 5_000) -> None:
+    source = build_store(renewals * 4)
+    cohort = select_cohort(source)[:renewals]
+    for workers in sorted({1, os.cpu_count() or 1}):
+        with tempfile.TemporaryDirectory() as output_dir:
+            report = generate_documents(source, cohort, output_dir, workers=workers)
+        print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+from app.services.intake import IntakeMessage, IntakePipeline
+from app.services.mock_store import MockStore
+from app.services.rollups import PortfolioRollups
+from app.services.search import SearchIndex
+
+
+TEXTS = [
+    "AC not cooling at all",
+    "المكيف لا يعمل",
+    "Water leaking from the ceiling, urgent",
+    "تسريب مياه في المطبخ",
+    "Power outage in the whole building",
+    "انقطاع الكهرباء عاجل",
+    "Door lock is stuck, minor",
+    "Cockroaches in the kitchen",
+]
+AREAS = ["Al Barsha", "Dubai Marina", "JBR", "Business Bay"]
+
+
+async def run(total: int, burst: int, interval: float, units: int) -> None:
+    target = MockStore()
+    target.seed()
+    SearchIndex.from_store(target)
+    PortfolioRollups.from_store(target)
+    pipeline = IntakePipeline.from_store(target)
+    rng = random.Random(3)
+
+    started = time.perf_counter()
+    sent = 0
+    while sent < total:
+        unit = rng.randrange(units)
+        pipeline.submit(
+            [
+                IntakeMessage(
+                    sender=f"+9715{unit:07d}",
+                    tenant_name=f"Tenant {unit}",
+                    unit=f"Unit {unit}",
+                    area=AREAS[unit % len(AREAS)],
+                    text=rng.choice(TEXTS),
+                )
+                for unit in (rng.randrange(units) for _ in range(burst))
+            ]
+        )
+        sent += burst
+        await asyncio.sleep(interval)
+    while pipeline.queue:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - started
+
+    stats = pipeline.stats
+    print(
+        f"{stats.processed:,} messages in {elapsed:.2f}s ({stats.processed / elapsed:,.0f} msg/s), "
+        f"{stats.batches:,} batches, {stats.tickets_created:,} tickets, {stats.duplicates:,} deduplicated, "
+        f"max queue lag {stats.max_lag_ms:.1f}ms"
+    )
+
+    backlog = [
+        IntakeMessage(sender="+971", tenant_name="T", unit=f"Unit {i % units}", area="JBR", text=TEXTS[i % len(TEXTS)])
+        for i in range(total)
+    ]
+    pipeline.queue.extend(backlog)
+    started = time.perf_counter()
+    pipeline.drain()
+    print(f"drained a {total:,}-message backlog at {total / (time.perf_counter() - started):,.0f} msg/s")
+
+
+def main(total: int = 50_000, burst: int = 500, interval: float = 0.01, units: int = 5_000) -> None:
+    asyncio.run(run(total, burst, interval, units))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import gc
+import tempfile
+import time
+
+from app.services.journal import MutationJournal
+from app.services.mock_store import MockStore, Vendor
+from benchmarks.search_index import build_store
+
+
+def main(entities: int = 1_000_000, tail: int = 5_000) -> None:
+    source = build_store(entities * 2 // 3)
+    for i in range(entities - len(source.tickets) - len(source.renewals)):
+        source.vendors[f"V-{i}"] = Vendor(
+            vendor_id=f"V-{i}",
+            name=f"Vendor {i}",
+            specialty="General",
+            area="Al Barsha",
+            availability="available",
+            response_minutes=45,
+            rating=4.5,
+            jobs_completed=100,
+            latitude=25.1,
+            longitude=55.2,
+            license_days_left=120,
+            insurance_valid=True,
+            emirates_id_verified=True,
+            trade_license_verified=True,
+        )
+    total = len(source.tickets) + len(source.renewals) + len(source.vendors)
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        journal = MutationJournal.open(source, directory, snapshot_every=tail * 10)
+        print(f"baseline snapshot of {total:,} entities in {time.perf_counter() - started:.2f}s")
+
+        ticket_ids = list(source.tickets)
+        started = time.perf_counter()
+        for i in range(tail):
+            source.advance_ticket(ticket_ids[i % len(ticket_ids)])
+        print(f"journaled {tail:,} mutations in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+        started = time.perf_counter()
+        journal.snapshot_in_background()
+        handoff_ms = (time.perf_counter() - started) * 1000
+        for i in range(tail):
+            source.advance_ticket(ticket_ids[i % len(ticket_ids)])
+        journal.close()
+        print(f"background snapshot: {handoff_ms:.0f}ms on the calling thread, {tail:,} more mutations meanwhile")
+
+        restored = MockStore()
+        # Same collector handling as app startup (build_services).
+        gc.disable()
+        started = time.perf_counter()
+        MutationJournal.open(restored, directory).close()
+        gc.enable()
+        print(f"restart: snapshot + {tail:,}+-entry tail replay in {time.perf_counter() - started:.2f}s")
+        assert len(restored.tickets) == len(source.tickets)
+        assert restored.tickets[ticket_ids[0]] == source.tickets[ticket_ids[0]]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.config import AppConfig
+from app.main import create_app
+
+
+def run(client: TestClient, polls: int) -> None:
+    html_bytes = 0
+    for _ in range(polls):
+        for path in ("/mobile/dashboard", "/hx/mobile/nav/tickets", "/hx/agent/activity-feed"):
+            html_bytes += len(client.get(path).content)
+
+    sync_bytes = 0
+    first = client.get("/api/mobile/sync")
+    sync_bytes += len(first.content)
+    version, epoch = int(first.headers["X-Store-Version"]), first.headers["X-Store-Epoch"]
+    changed_polls = 0
+    for i in range(polls):
+        if i % 5 == 0:
+            client.get("/hx/tickets/M-1247/timeline")
+        response = client.get("/api/mobile/sync", params={"since": version, "epoch": epoch})
+        sync_bytes += len(response.content)
+        changed_polls += response.status_code == 200
+        version = int(response.headers["X-Store-Version"])
+
+    print(f"HTML refresh: {polls} polls x 3 requests = {html_bytes:,} bytes")
+    print(f"delta sync:   1 full + {polls} polls ({changed_polls} with changes) = {sync_bytes:,} bytes")
+
+
+def main(polls: int = 20) -> None:
+    with TestClient(create_app(AppConfig(serve_static=False, poll_burst=polls * 10))) as client:
+        run(client, polls)
+
+
+if __name__ == "__main__":
+    main()
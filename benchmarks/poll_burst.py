@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.config import AppConfig
+from app.routes.hx import router as hx_router
+from app.services.rate_limit import CLIENT_COOKIE, sign_client_id
+from app.services.runtime import build_services
+
+
+POLL_PATHS = ["/hx/agent/activity-feed?lang=en", "/hx/agent/status?lang=ar"]
+
+
+async def burst(client: httpx.AsyncClient, clients: int, secret: str) -> list[float]:
+    # Synchronized pollers all fire at the same instant, so latency runs from the start of
+    # the burst: a request that only starts once earlier ones have finished still waited.
+    cookies = [sign_client_id(f"dashboard-{client_id}", secret) for client_id in range(clients)]
+    started = time.perf_counter()
+
+    async def poll(path: str, client_id: int) -> float:
+        response = await client.get(path, headers={"Cookie": f"{CLIENT_COOKIE}={cookies[client_id]}"})
+        response.raise_for_status()
+        return (time.perf_counter() - started) * 1000
+
+    return await asyncio.gather(*(poll(POLL_PATHS[i % len(POLL_PATHS)], i) for i in range(clients)))
+
+
+async def run(enabled: bool, clients: int, rounds: int, backend: str = "memory") -> None:
+    app = FastAPI()
+    app.include_router(hx_router)
+    # Isolate coalescing from rate limiting and shedding.
+    config = AppConfig(
+        store_backend=backend, shard_count=2, coalesce_polls=enabled, poll_max_inflight=clients * 2
+    )
+    services = app.state.services = build_services(config)
+    samples: list[float] = []
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for _ in range(rounds):
+                samples.extend(await burst(client, clients, config.client_id_secret))
+    finally:
+        services.close()
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    label = f"{backend}/{'coalesced' if enabled else 'independent'}"
+    print(
+        f"{label:>19}: {len(samples):,} requests  median {statistics.median(samples):.1f}ms  "
+        f"p99 {p99:.1f}ms  renders {services.single_flight.calls:,}  shared {services.single_flight.shared:,}"
+    )
+
+
+def main(clients: int = 500, rounds: int = 5) -> None:
+    for backend in ("memory", "sharded"):
+        for enabled in (False, True):
+            asyncio.run(run(enabled, clients, rounds, backend))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.config import AppConfig
+from app.routes.hx import router as hx_router
+from app.services.rate_limit import CLIENT_COOKIE, sign_client_id
+from app.services.runtime import build_services
+
+
+async def run(max_inflight: int, pollers: int, posts: int) -> None:
+    app = FastAPI()
+    app.include_router(hx_router)
+    config = AppConfig(poll_max_inflight=max_inflight)
+    app.state.services = build_services(config)
+    poll_limiter = app.state.services.poll_limiter
+    kiosks = [sign_client_id(f"kiosk-{i}", config.client_id_secret) for i in range(20)]
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def poll(i: int) -> int:
+            response = await client.get(
+                f"/hx/tickets/M-1247/timeline?lang=en&tab={i % 50}",
+                headers={"Cookie": f"{CLIENT_COOKIE}={kiosks[i % 20]}"},
+            )
+            return response.status_code
+
+        async def interactive() -> float:
+            started = time.perf_counter()
+            response = await client.post("/hx/rera/calculate", data={"unit_id": "U-402", "proposed_rent": "87000"})
+            response.raise_for_status()
+            return (time.perf_counter() - started) * 1000
+
+        results = await asyncio.gather(
+            *(poll(i) for i in range(pollers)),
+            *(interactive() for _ in range(posts)),
+        )
+
+    statuses = results[:pollers]
+    post_ms = sorted(results[pollers:])
+    print(
+        f"max_inflight={max_inflight:>6}: polls ok {statuses.count(200):,} / 429 {statuses.count(429):,} "
+        f"(throttled {poll_limiter.throttled:,}, shed {poll_limiter.shed:,})  "
+        f"POST median {statistics.median(post_ms):.1f}ms  p99 {post_ms[int(len(post_ms) * 0.99) - 1]:.1f}ms"
+    )
+
+
+def main(pollers: int = 2_000, posts: int = 100) -> None:
+    for max_inflight in (pollers * 10, 64):
+        asyncio.run(run(max_inflight, pollers, posts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import statistics
+import time
+
+from app.services.mock_store import MockStore
+from app.services.search import SearchIndex
+
+
+QUERIES = [
+    "sara", "al bar", "m-1042", "unit 4", "plumb mar", "احمد", "فاطمه", "zzz", "j", "electrical jbr",
+    "repair lock", "ac pest", "a b c",
+]
+
+
+def build_store(records: int, seed: int = 7) -> MockStore:
+    source = MockStore()
+    source.seed_synthetic(records, seed=seed)
+    return source
+
+
+def main(records: int = 500_000, rounds: int = 200) -> None:
+    source = build_store(records)
+    started = time.perf_counter()
+    index = SearchIndex()
+    index.rebuild(source)
+    build_seconds = time.perf_counter() - started
+    print(f"indexed {len(index.documents):,} documents / {len(index.vocabulary):,} tokens in {build_seconds:.2f}s")
+
+    for query in QUERIES:
+        samples = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            index.search(query)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        p99 = samples[int(len(samples) * 0.99) - 1]
+        print(f"{query!r:>18}: median {statistics.median(samples):.3f}ms  p99 {p99:.3f}ms")
+
+    started = time.perf_counter()
+    for ticket_id in list(source.tickets)[:10_000]:
+        index.on_store_event("ticket", ticket_id, source.tickets[ticket_id])
+    print(f"10,000 incremental re-index events in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+import random
+import time
+
+from app.services.sharding import ShardedStore
+from benchmarks.search_index import build_store
+
+
+def main(records: int = 1_200_000, rounds: int = 20, batch: int = 20_000) -> None:
+    source = build_store(records)
+    unit_ids = list(source.renewals)
+    rng = random.Random(11)
+    print(f"{len(source.tickets):,} tickets / {len(unit_ids):,} renewals, {os.cpu_count()} CPUs")
+
+    baseline: float | None = None
+    for shard_count in (1, 2, 4, 8):
+        sharded = ShardedStore.start(source, shard_count)
+        try:
+            # Wait for every shard to finish building its local rollups before timing.
+            sharded.dashboard_counts()
+            sizes = sharded.shard_sizes()
+            started = time.perf_counter()
+            for _ in range(rounds):
+                sharded.send_notices()
+                sharded.dashboard_counts()
+            scans_per_second = rounds / (time.perf_counter() - started)
+
+            keys = [("rera", unit_id, 90_000) for unit_id in rng.sample(unit_ids, batch)]
+            started = time.perf_counter()
+            sharded.fetch_many(keys)
+            lookups_per_second = batch / (time.perf_counter() - started)
+        finally:
+            sharded.close()
+
+        baseline = baseline or scans_per_second
+        print(
+            f"{shard_count} shard(s): {scans_per_second:6.1f} portfolio scans/s "
+            f"({scans_per_second / baseline:.2f}x)  {lookups_per_second:,.0f} routed lookups/s  "
+            f"entities per shard: {', '.join(f'{size:,}' for size in sizes)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import random
+import statistics
+import time
+
+from app.services.mock_store import MockStore, Vendor
+from app.services.vendor_ranking import AREA_COORDINATES, VendorRanking, score_vendor
+
+
+SPECIALTIES = ["HVAC", "Plumbing", "Electrical", "General"]
+
+
+def build_vendors(source: MockStore, count: int, seed: int = 11) -> None:
+    rng = random.Random(seed)
+    areas = list(AREA_COORDINATES)
+    for i in range(count):
+        area = rng.choice(areas)
+        lat, lon = AREA_COORDINATES[area]
+        source.vendors[f"V-{i}"] = Vendor(
+            vendor_id=f"V-{i}",
+            name=f"Vendor {i}",
+            specialty=rng.choice(SPECIALTIES),
+            area=area,
+            availability=rng.choice(["available", "busy"]),
+            response_minutes=rng.randint(15, 180),
+            rating=round(rng.uniform(3.0, 5.0), 1),
+            jobs_completed=rng.randint(0, 800),
+            latitude=lat + rng.uniform(-0.02, 0.02),
+            longitude=lon + rng.uniform(-0.02, 0.02),
+            license_days_left=rng.randint(-10, 365),
+            insurance_valid=rng.random() > 0.1,
+            emirates_id_verified=rng.random() > 0.05,
+            trade_license_verified=rng.random() > 0.05,
+        )
+    source.notify_reset()
+
+
+def full_sort(ranking: VendorRanking, specialty: str, area: str) -> list[str]:
+    scored = [
+        (score, vendor_id)
+        for vendor_id, vendor in ranking.vendors.items()
+        if (score := score_vendor(vendor, specialty, area, ranking.open_jobs[vendor.name])) is not None
+    ]
+    scored.sort(reverse=True)
+    return [vendor_id for _, vendor_id in scored[: ranking.k]]
+
+
+def main(vendors: int = 100_000, requests: int = 2_000, updates: int = 20_000) -> None:
+    source = MockStore()
+    source.seed()
+    ranking = VendorRanking.from_store(source)
+    build_vendors(source, vendors)
+    rng = random.Random(5)
+    keys = [(specialty, area) for specialty in SPECIALTIES for area in AREA_COORDINATES]
+
+    started = time.perf_counter()
+    for specialty, area in keys:
+        ranking.shortlist(specialty, area)
+    print(f"{vendors:,} vendors: built {len(keys)} (specialty, area) buckets in {time.perf_counter() - started:.2f}s")
+
+    samples = []
+    for _ in range(requests):
+        specialty, area = rng.choice(keys)
+        started = time.perf_counter()
+        ranking.shortlist(specialty, area)
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"cached shortlist: median {statistics.median(samples):.4f}ms  max {max(samples):.3f}ms")
+
+    samples = []
+    for _ in range(20):
+        specialty, area = rng.choice(keys)
+        started = time.perf_counter()
+        full_sort(ranking, specialty, area)
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"re-sort per request: median {statistics.median(samples):.1f}ms")
+
+    vendor_ids = list(source.vendors)
+    started = time.perf_counter()
+    for i in range(updates):
+        vendor = source.vendors[rng.choice(vendor_ids)]
+        if i % 2:
+            vendor.availability = "available" if vendor.availability == "busy" else "busy"
+        else:
+            vendor.insurance_valid = not vendor.insurance_valid
+        ranking.on_store_event("vendor", vendor.vendor_id, vendor)
+        if i % 10 == 0:
+            ranking.shortlist(*rng.choice(keys))
+    elapsed = time.perf_counter() - started
+    print(f"{updates:,} availability/compliance updates with interleaved reads: {updates / elapsed:,.0f} updates/s")
+
+    mismatches = sum(
+        [ranked.vendor.vendor_id for ranked in ranking.shortlist(specialty, area)] != full_sort(ranking, specialty, area)
+        for specialty, area in keys
+    )
+    print(f"shortlists matching a full re-sort: {len(keys) - mismatches}/{len(keys)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import AppConfig
+from app.main import create_app
+from app.services.coalesce import SingleFlight
+
+
+def test_concurrent_calls_share_one_compute() -> None:
+    flight = SingleFlight()
+    computed = 0
+
+    async def compute() -> int:
+        nonlocal computed
+        computed += 1
+        await asyncio.sleep(0.01)
+        return computed
+
+    async def scenario() -> list[int]:
+        return await asyncio.gather(*(flight.do("key", compute) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == [1] * 5
+    assert (flight.calls, flight.shared) == (1, 4)
+    assert flight.inflight == {}
+
+
+def test_cancelled_first_caller_does_not_cancel_followers() -> None:
+    flight = SingleFlight()
+
+    async def compute() -> str:
+        await asyncio.sleep(0.01)
+        return "rendered"
+
+    async def scenario() -> str:
+        first = asyncio.create_task(flight.do("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await follower
+
+    assert asyncio.run(scenario()) == "rendered"
+
+
+def test_failure_reaches_every_caller() -> None:
+    flight = SingleFlight()
+
+    async def compute() -> None:
+        await asyncio.sleep(0.01)
+        raise LookupError("store down")
+
+    async def scenario() -> list[object]:
+        return await asyncio.gather(*(flight.do("key", compute) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, LookupError) for result in asyncio.run(scenario()))
+    assert flight.inflight == {}
+
+
+def test_ticket_timeline_advances_on_every_poll() -> None:
+    app = create_app(AppConfig(serve_static=False))
+    with TestClient(app) as client:
+        ticket = app.state.services.store.tickets["M-1247"]
+        before = ticket.sla_minutes_remaining
+        for _ in range(2):
+            assert client.get("/hx/tickets/M-1247/timeline").status_code == 200
+
+        assert ticket.sla_minutes_remaining == before - 4
+        assert app.state.services.single_flight.calls == 0
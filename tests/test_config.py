@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+
+from app.config import AppConfig
+
+
+def test_from_env_reads_every_setting(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name, value in {
+        "HOMEBASE_STORE_BACKEND": "sharded",
+        "HOMEBASE_SHARDS": "2",
+        "HOMEBASE_SHARD_PROCESSES": "0",
+        "HOMEBASE_SERVE_STATIC": "false",
+        "HOMEBASE_POLL_RATE": "2.5",
+        "HOMEBASE_POLL_BURST": "4",
+        "HOMEBASE_POLL_MAX_INFLIGHT": "32",
+        "HOMEBASE_COALESCE_POLLS": "no",
+        "HOMEBASE_CLIENT_ID_SECRET": "shared-between-workers",
+    }.items():
+        monkeypatch.setenv(name, value)
+
+    config = AppConfig.from_env()
+    assert config == AppConfig(
+        store_backend="sharded",
+        shard_count=2,
+        shard_processes=False,
+        serve_static=False,
+        poll_rate=2.5,
+        poll_burst=4,
+        poll_max_inflight=32,
+        coalesce_polls=False,
+    )
+    assert config.client_id_secret == "shared-between-workers"
+
+
+def test_from_env_defaults(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("HOMEBASE_SHARD_PROCESSES", raising=False)
+    monkeypatch.setenv("HOMEBASE_SERVE_STATIC", "")
+
+    config = AppConfig.from_env()
+    assert config.shard_processes and config.serve_static and config.coalesce_polls
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import AppConfig
+from app.main import create_app
+from app.services.contract_batch import DocumentBatchRunner, draft_contract, generate_documents
+from app.services.mock_store import MockStore
+
+
+def seeded_store() -> MockStore:
+    store = MockStore()
+    store.seed()
+    return store
+
+
+def statement(output: Path, lang: str = "en") -> str:
+    text = (output / f"R-402-2026-offer-{lang}.html").read_text(encoding="utf-8")
+    line = next(line for line in text.splitlines() if "RERA" in line or "ريرا" in line)
+    assert line == next(
+        line for line in (output / f"R-402-2026-contract-{lang}.html").read_text(encoding="utf-8").splitlines()
+        if "RERA" in line or "ريرا" in line
+    )
+    return line
+
+
+@pytest.mark.parametrize(
+    ("current_rent", "contract_rent", "expected"),
+    [
+        (85_000, 87_000, "Increase of 2.4% is within the permitted 4.2% cap."),
+        (85_000, 95_000, "Increase of 11.8% exceeds the permitted 4.2% cap; manager review is required"),
+        (100_000, 87_000, "Proposed rent is 13,000 AED (13.0%) below the current rent"),
+        (87_000, 87_000, "Rent is unchanged."),
+    ],
+)
+def test_statement_follows_the_rera_check(
+    tmp_path: Path, current_rent: int, contract_rent: int, expected: str
+) -> None:
+    store = seeded_store()
+    store.renewals["U-402"].current_rent_aed = current_rent
+    store.contracts["U-402"].rent_aed = contract_rent
+
+    generate_documents(store, ["U-402"], tmp_path, workers=1)
+
+    assert expected in statement(tmp_path)
+
+
+def test_arabic_statement_for_a_decrease(tmp_path: Path) -> None:
+    store = seeded_store()
+    store.renewals["U-402"].current_rent_aed = 100_000
+
+    generate_documents(store, ["U-402"], tmp_path, workers=1)
+
+    assert "أقل من الإيجار الحالي" in statement(tmp_path, "ar")
+
+
+def test_runner_allows_one_batch_at_a_time(tmp_path: Path) -> None:
+    store = seeded_store()
+    store.seed_synthetic(400)
+    runner = DocumentBatchRunner(output_dir=tmp_path, workers=2)
+
+    async def scenario() -> None:
+        assert runner.start(store)
+        assert not runner.start(store)
+        await runner.wait()
+        pool = runner._pool
+        assert runner.start(store)
+        await runner.wait()
+        assert runner._pool is pool
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        runner.close()
+    assert runner.state == "done"
+    assert runner.report is not None
+    assert len(runner.report.documents) == runner.renewals * 4
+
+
+def test_generate_documents_route_polls_until_done(tmp_path: Path) -> None:
+    # Default poll limits: the status poll must not draw on the dashboard's poll budget.
+    app = create_app(AppConfig(serve_static=False, documents_dir=str(tmp_path)))
+    with TestClient(app) as client:
+        started = client.post("/hx/renewals/generate-documents")
+        assert 'hx-get="/hx/renewals/documents/status' in started.text
+
+        deadline = time.monotonic() + 30
+        status = client.get("/hx/renewals/documents/status")
+        while "hx-get" in status.text and time.monotonic() < deadline:
+            time.sleep(0.05)
+            status = client.get("/hx/renewals/documents/status")
+
+        statuses = [client.get("/hx/renewals/documents/status").status_code for _ in range(30)]
+
+    assert statuses == [200] * 30
+    assert "Generated" in status.text
+    assert "hx-get" not in status.text
+    assert list(tmp_path.glob("*-offer-en.html"))
+
+
+def test_drafted_contract_records_its_drafting_time() -> None:
+    store = seeded_store()
+    store.seed_synthetic(10)
+    unit_id = next(unit_id for unit_id in store.renewals if unit_id not in store.contracts)
+
+    assert draft_contract(store, unit_id).generated_seconds >= 1
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import gc
+import weakref
+from collections.abc import Iterator
+
+import pytest
+
+from app.config import AppConfig
+from app.services.runtime import Services, build_services
+
+KEYS = [
+    ("agent_state",),
+    ("ticket", "M-1247"),
+    ("dashboard_counts",),
+    ("vendor_shortlist", "M-1247"),
+    ("vendor_shortlist", "M-404"),
+]
+
+
+@pytest.fixture
+def memory() -> Iterator[Services]:
+    services = build_services(AppConfig())
+    yield services
+    services.close()
+
+
+@pytest.fixture
+def sharded() -> Iterator[Services]:
+    services = build_services(AppConfig(store_backend="sharded", shard_count=3, shard_processes=False))
+    yield services
+    services.close()
+
+
+def test_derived_kinds_join_the_store_batch(memory: Services, monkeypatch: pytest.MonkeyPatch) -> None:
+    store_batches: list[list] = []
+    fetch_many = memory.local_store.fetch_many
+    monkeypatch.setattr(memory.local_store, "fetch_many", lambda keys: store_batches.append(keys) or fetch_many(keys))
+
+    _, ticket, counts, shortlist, missing = memory.fetch_many(KEYS)
+
+    assert store_batches == [[("agent_state",), ("ticket", "M-1247")]]
+    assert counts["open_tickets"] == 2
+    assert shortlist[0].vendor.specialty == ticket.category
+    assert isinstance(missing, KeyError)
+
+
+def test_sharded_batch_matches_memory(memory: Services, sharded: Services, monkeypatch: pytest.MonkeyPatch) -> None:
+    rounds: list[dict] = []
+    scatter = sharded.store.scatter
+    monkeypatch.setattr(sharded.store, "scatter", lambda calls: rounds.append(calls) or scatter(calls))
+
+    expected = memory.fetch_many(KEYS)
+    _, ticket, counts, shortlist, missing = sharded.fetch_many(KEYS)
+
+    # The shortlist needs the ticket first, so it adds exactly one round.
+    assert len(rounds) == 2
+    assert ticket == expected[1]
+    assert counts["open_tickets"] == expected[2]["open_tickets"]
+    assert counts["open_by_area"] == expected[2]["open_by_area"]
+    assert [ranked.vendor.vendor_id for ranked in shortlist] == [ranked.vendor.vendor_id for ranked in expected[3]]
+    assert isinstance(missing, KeyError)
+
+
+def test_closed_services_release_their_store() -> None:
+    services = build_services(AppConfig())
+    store = weakref.ref(services.store)
+    services.close()
+    del services
+    gc.collect()
+
+    assert store() is None
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.intake import IntakeMessage, IntakePipeline, classify, ticket_category
+from app.services.mock_store import MockStore
+
+
+def pipeline() -> IntakePipeline:
+    store = MockStore()
+    store.seed()
+    return IntakePipeline.from_store(store)
+
+
+@pytest.mark.parametrize("category", ["HVAC", "Plumbing", "Electrical", "Pest Control", "Locks & Doors", "General"])
+def test_created_titles_classify_as_their_category(category: str) -> None:
+    assert classify(f"{category} issue").category == category
+
+
+@pytest.mark.parametrize(
+    ("text", "category"),
+    [
+        ("المكيف لا يعمل", "HVAC"),
+        ("تسريب في الحمام", "Plumbing"),
+        ("الباب لا يفتح", "Locks & Doors"),
+        ("انقطاع الكهرباء في الشقة", "Electrical"),
+    ],
+)
+def test_arabic_definite_article_is_stripped(text: str, category: str) -> None:
+    assert classify(text).category == category
+
+
+def test_repeat_reports_are_folded_per_area_and_unit() -> None:
+    intake = pipeline()
+    created = intake.process_batch(
+        [
+            IntakeMessage("+971500000001", "Sara", "Unit 12", "JBR", "AC not cooling"),
+            IntakeMessage("+971500000002", "Omar", "Unit 12", "JBR", "المكيف لا يعمل"),
+            IntakeMessage("+971500000003", "Layla", "Unit 12", "Deira", "AC not cooling"),
+        ]
+    )
+
+    assert [(ticket.area, ticket.category) for ticket in created] == [("JBR", "HVAC"), ("Deira", "HVAC")]
+    assert intake.stats.duplicates == 1
+
+
+def test_reindex_keys_on_stored_category() -> None:
+    intake = pipeline()
+    (ticket,) = intake.process_batch([IntakeMessage("+971500000001", "Sara", "Unit 7", "JBR", "door is stuck")])
+    intake.reindex()
+
+    assert ticket_category(ticket) == "Locks & Doors"
+    assert intake.open_reports[("JBR", "Unit 7", "Locks & Doors")] == ticket.ticket_id
+    intake.process_batch([IntakeMessage("+971500000002", "Omar", "Unit 7", "JBR", "lock broken")])
+    assert intake.stats.duplicates == 1
+
+
+def test_failing_batch_is_logged_and_the_worker_keeps_running(caplog: pytest.LogCaptureFixture) -> None:
+    intake = pipeline()
+    failures = iter([True])
+
+    def flaky_listener(kind: str, key: str | None, entity: object) -> None:
+        if kind == "ticket" and next(failures, False):
+            raise OSError("journal disk full")
+
+    intake.target.subscribe(flaky_listener)
+    intake.linger_seconds = 0
+
+    async def scenario() -> None:
+        intake.submit([IntakeMessage("+971500000001", "Sara", "Unit 7", "JBR", "door is stuck")])
+        while intake.stats.batches + intake.stats.failed < 1:
+            await asyncio.sleep(0.001)
+        intake.submit([IntakeMessage("+971500000002", "Omar", "Unit 9", "JBR", "AC not cooling")])
+        while intake.stats.batches < 1:
+            await asyncio.sleep(0.001)
+        worker = intake._worker
+        intake.close()
+        assert worker is not None
+        await asyncio.sleep(0)
+        assert worker.cancelled()
+
+    asyncio.run(scenario())
+
+    assert intake.stats.failed == 1
+    assert intake.stats.tickets_created == 1
+    assert "Intake batch of 1 message(s) failed" in caplog.text
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import json
+import logging
+import pickle
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.services.journal import MutationJournal, encode_snapshot, read_snapshot_payload
+from app.services.mock_store import ActivityItem, MockStore
+
+
+def seeded_store(records: int = 0) -> MockStore:
+    store = MockStore()
+    store.seed()
+    if records:
+        store.seed_synthetic(records)
+    return store
+
+
+def restore(directory: Path) -> MockStore:
+    restored = MockStore()
+    MutationJournal.open(restored, directory).close()
+    return restored
+
+
+def assert_same_state(restored: MockStore, source: MockStore) -> None:
+    assert restored.tickets == source.tickets
+    assert restored.vendors == source.vendors
+    assert restored.renewals == source.renewals
+    assert restored.contracts == source.contracts
+    assert restored.activity_log == source.activity_log
+    assert restored.compliance == source.compliance
+    assert restored.cheque_schedules == source.cheque_schedules
+
+
+def mutate(store: MockStore, rounds: int) -> None:
+    ticket_ids = list(store.tickets)
+    for i in range(rounds):
+        store.advance_ticket(ticket_ids[i % len(ticket_ids)])
+    store.assign_vendor("M-1247", "V-PLB-11")
+    store.bulk_process_renewals()
+    store.record_activity(ActivityItem("Journal test action", "09:15"))
+
+
+def test_snapshot_and_tail_replay_round_trip(tmp_path: Path) -> None:
+    source = seeded_store(2_000)
+    journal = MutationJournal.open(source, tmp_path, snapshot_every=25)
+    mutate(source, 60)
+    journal.close()
+
+    assert len(list(tmp_path.glob("snapshot-*.bin"))) >= 2
+    assert journal.snapshot_seq > 0
+    assert_same_state(restore(tmp_path), source)
+
+
+def test_background_snapshot_with_concurrent_mutations(tmp_path: Path) -> None:
+    source = seeded_store(20_000)
+    journal = MutationJournal.open(source, tmp_path, snapshot_every=1_000_000)
+    mutate(source, 10)
+    assert journal.snapshot_in_background()
+    # Keep mutating while the snapshot thread is encoding the same entities.
+    mutate(source, 500)
+    journal.close()
+
+    assert journal.snapshot_seq > 0
+    assert_same_state(restore(tmp_path), source)
+
+
+def test_restart_continues_the_same_journal(tmp_path: Path) -> None:
+    source = seeded_store()
+    MutationJournal.open(source, tmp_path, snapshot_every=1_000).close()
+    restored = MockStore()
+    journal = MutationJournal.open(restored, tmp_path)
+    mutate(restored, 5)
+    journal.close()
+
+    assert_same_state(restore(tmp_path), restored)
+
+
+def test_torn_final_line_is_ignored(tmp_path: Path) -> None:
+    source = seeded_store()
+    journal = MutationJournal.open(source, tmp_path)
+    mutate(source, 3)
+    journal.close()
+    segment = sorted(tmp_path.glob("journal-*.jsonl"))[-1]
+    with segment.open("a", encoding="utf-8") as handle:
+        handle.write('{"seq": 999, "kind": "tick')
+
+    assert_same_state(restore(tmp_path), source)
+
+
+def write_format_1_snapshot(directory: Path, source: MockStore) -> None:
+    # Format 1 stored unnamed columns in field order, and Vendor still had ai_recommended.
+    payload = read_snapshot_payload(encode_snapshot(source, 0))
+    for name, value in payload.items():
+        if name in ("format", "seq"):
+            continue
+        keys, columns = value if name in ("tickets", "vendors", "renewals", "contracts") else (None, value)
+        columns = [tuple(column[1:]) for column in columns]
+        if name == "vendors":
+            columns.insert(8, ("raw", [False] * len(keys)))
+        payload[name] = columns if keys is None else (keys, columns)
+    payload["format"] = 1
+    (directory / f"snapshot-{0:012d}.bin").write_bytes(pickle.dumps(payload))
+
+
+def test_format_1_journal_is_restored(tmp_path: Path) -> None:
+    source = seeded_store()
+    write_format_1_snapshot(tmp_path, source)
+    vendor = source.reserve_vendor("V-PLB-11")
+    entity = {**vars(vendor), "ai_recommended": True}
+    record = {"seq": 1, "at": "2026-01-01T09:00:00.000", "kind": "vendor", "key": "V-PLB-11", "entity": entity}
+    (tmp_path / f"journal-{1:012d}.jsonl").write_text(json.dumps(record) + "\n", encoding="utf-8")
+
+    assert_same_state(restore(tmp_path), source)
+
+
+def test_unreadable_journal_falls_back_to_seed(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    (tmp_path / f"snapshot-{5:012d}.bin").write_bytes(b"not a snapshot")
+    source = seeded_store()
+    with caplog.at_level(logging.WARNING, logger="app.services.journal"):
+        journal = MutationJournal.open(source, tmp_path)
+    mutate(source, 3)
+    journal.close()
+
+    assert "re-seeding" in caplog.text
+    assert len(list(tmp_path.glob("unrestorable-*/snapshot-*.bin"))) == 1
+    assert_same_state(restore(tmp_path), source)
+
+
+def test_failed_restore_leaves_the_seeded_store(tmp_path: Path) -> None:
+    source = seeded_store()
+    journal = MutationJournal.open(source, tmp_path)
+    source.advance_ticket("M-1247")
+    source.advance_ticket("M-1247")
+    source.bulk_process_renewals()
+    journal.close()
+    segment = sorted(tmp_path.glob("journal-*.jsonl"))[-1]
+    with segment.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"seq": journal.seq + 1, "at": "", "kind": "ticket", "key": "M-1", "entity": {}}) + "\n")
+
+    restored = seeded_store()
+    MutationJournal.open(restored, tmp_path).close()
+
+    assert_same_state(restored, seeded_store())
+    assert_same_state(restore(tmp_path), seeded_store())
+
+
+def test_repeated_failed_starts_each_quarantine(tmp_path: Path) -> None:
+    for _ in range(2):
+        (tmp_path / f"snapshot-{5:012d}.bin").write_bytes(b"not a snapshot")
+        MutationJournal.open(seeded_store(), tmp_path).close()
+
+    quarantined = list(tmp_path.glob("unrestorable-*"))
+    assert len(quarantined) == 2
+    assert all((aside / f"snapshot-{5:012d}.bin").exists() for aside in quarantined)
+
+
+def test_format_3_pickled_snapshot_is_restored(tmp_path: Path) -> None:
+    source = seeded_store(500)
+    payload = {**read_snapshot_payload(encode_snapshot(source, 0)), "format": 3}
+    (tmp_path / f"snapshot-{0:012d}.bin").write_bytes(pickle.dumps(payload))
+
+    assert_same_state(restore(tmp_path), source)
+
+
+class _TouchOnLoad:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (Path.touch, (self.path,))
+
+
+def test_pickled_snapshot_cannot_run_code(tmp_path: Path) -> None:
+    marker = tmp_path / "ran"
+    payload = {"format": 3, "seq": 1, "tickets": _TouchOnLoad(marker)}
+    (tmp_path / f"snapshot-{1:012d}.bin").write_bytes(pickle.dumps(payload))
+
+    assert_same_state(restore(tmp_path), MockStore())
+    assert not marker.exists()
+    assert len(list(tmp_path.glob("unrestorable-*/snapshot-*.bin"))) == 1
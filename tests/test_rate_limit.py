@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import AppConfig
+from app.main import create_app
+from app.services.rate_limit import CLIENT_COOKIE
+
+BURST = 5
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    return create_app(AppConfig(serve_static=False, poll_burst=BURST))
+
+
+def test_client_cookie_is_issued_once(app: FastAPI) -> None:
+    with TestClient(app) as client:
+        first = client.get("/health")
+        second = client.get("/health")
+
+    assert CLIENT_COOKIE in first.cookies
+    assert "set-cookie" not in second.headers
+
+
+def test_clients_behind_one_address_are_limited_separately(app: FastAPI) -> None:
+    with TestClient(app) as noisy, TestClient(app) as quiet:
+        noisy.get("/health")
+        quiet.get("/health")
+        statuses = [noisy.get("/hx/agent/status").status_code for _ in range(BURST)]
+        throttled = noisy.get("/hx/agent/status")
+
+        assert statuses == [200] * BURST
+        assert throttled.status_code == 429
+        assert "poll-backoff" in throttled.headers["HX-Trigger"]
+        assert quiet.get("/hx/agent/status").status_code == 200
+        # Tab taps are not polls and are never throttled.
+        assert noisy.get("/hx/mobile/nav/renewals").status_code == 200
+
+
+def test_forged_client_ids_fall_back_to_the_address(app: FastAPI) -> None:
+    with TestClient(app) as client:
+        statuses = [
+            client.get("/hx/agent/status", cookies={CLIENT_COOKIE: f"forged-{i}"}).status_code
+            for i in range(BURST + 1)
+        ]
+        reissued = client.get("/health", cookies={CLIENT_COOKIE: "forged"})
+
+        assert statuses == [200] * BURST + [429]
+        assert len(app.state.services.poll_limiter.buckets) == 1
+        assert reissued.cookies[CLIENT_COOKIE] != "forged"
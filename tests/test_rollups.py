@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from app.services.mock_store import ActivityItem, MockStore
+from app.services.rollups import HOURLY_RETENTION_DAYS, PortfolioRollups
+
+
+def test_actions_are_counted_per_day_and_hour() -> None:
+    store = MockStore()
+    store.seed()
+    rollups = PortfolioRollups.from_store(store)
+    today = date.today()
+    yesterday = (today - timedelta(days=1)).isoformat()
+    seeded = rollups.actions_today
+
+    store.record_activity(ActivityItem("Late action", "23:50", date=yesterday))
+    store.record_activity(ActivityItem("Early action", "00:05"))
+
+    counts = rollups.counts()
+    assert counts["actions_today"] == seeded + 1
+    assert counts["actions_total"] == seeded + 2
+    assert counts["actions_by_hour"][f"{yesterday} 23:00"] == 1
+    assert counts["actions_by_hour"][f"{today.isoformat()} 00:00"] == 1
+
+
+def test_old_hourly_buckets_roll_off() -> None:
+    store = MockStore()
+    rollups = PortfolioRollups.from_store(store)
+    start = date.today() - timedelta(days=HOURLY_RETENTION_DAYS + 3)
+    for offset in range(HOURLY_RETENTION_DAYS + 4):
+        store.record_activity(ActivityItem("Action", "10:00", date=(start + timedelta(days=offset)).isoformat()))
+
+    assert len(rollups.actions_by_day) == HOURLY_RETENTION_DAYS + 4
+    assert len(rollups.actions_by_hour) == HOURLY_RETENTION_DAYS + 1
+    assert rollups.actions_today == 1
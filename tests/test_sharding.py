@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import AppConfig
+from app.main import create_app
+from app.services.mock_store import MockStore
+from app.services.sharding import ShardHandler, ShardedStore, portfolio_of
+
+
+def seeded_store() -> MockStore:
+    store = MockStore()
+    store.seed()
+    return store
+
+
+def test_failing_call_is_returned_not_raised() -> None:
+    handler = ShardHandler(seeded_store())
+
+    missing, broken, ticket = handler.execute(
+        [("get_ticket", ("M-404",)), ("calculate_rera", ("U-402", None)), ("get_ticket", ("M-1247",))]
+    )
+
+    assert isinstance(missing, KeyError)
+    assert isinstance(broken, TypeError)
+    assert ticket.ticket_id == "M-1247"
+
+
+def test_shard_process_survives_a_failing_call() -> None:
+    store = ShardedStore.start(seeded_store(), 2)
+    try:
+        with pytest.raises(TypeError):
+            store.calculate_rera("U-402", None)  # type: ignore[arg-type]
+        assert store.dead_shards() == []
+        assert store.get_ticket("M-1247").ticket_id == "M-1247"
+    finally:
+        store.close()
+
+
+def test_dead_shard_is_reported() -> None:
+    app = create_app(AppConfig(store_backend="sharded", shard_count=2, serve_static=False))
+    with TestClient(app) as client:
+        assert client.get("/health").json() == {"status": "ok"}
+        shard = app.state.services.store.shards[0]
+        shard.process.kill()
+        shard.process.join()
+
+        health = client.get("/health")
+        assert health.status_code == 503
+        assert health.json() == {"status": "degraded", "dead_shards": [0]}
+        page = client.get("/analytics")
+        assert page.status_code == 503
+        assert page.json()["shards"] == [0]
+
+
+def test_portfolios_are_spread_across_shards() -> None:
+    source = MockStore()
+    source.seed_synthetic(20_000)
+    store = ShardedStore.start(source, 4, processes=False)
+
+    sizes = store.shard_sizes()
+    assert sum(sizes) == len(source.tickets) + len(source.vendors) + len(source.renewals)
+    assert min(sizes) > 0
+    assert max(sizes) <= 2.2 * min(sizes)
+    portfolios = store.directory["portfolios"]
+    assert len(set(portfolios.values())) == 4
+    for unit_id, renewal in source.renewals.items():
+        assert store.directory["renewals"][unit_id] == portfolios[portfolio_of(renewal.area)]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.config import AppConfig
+from app.main import create_app
+from app.services.mock_store import ActivityItem, MockStore
+from app.services.sync import ChangeFeed
+
+
+def sync(client: TestClient, version: int = 0, epoch: str = ""):
+    return client.get("/api/mobile/sync", params={"since": version, "epoch": epoch})
+
+
+def test_delta_within_an_epoch() -> None:
+    with TestClient(create_app(AppConfig(serve_static=False))) as client:
+        first = sync(client)
+        version, epoch = int(first.headers["X-Store-Version"]), first.headers["X-Store-Epoch"]
+        assert first.json()["full"] == 1
+
+        assert sync(client, version, epoch).status_code == 204
+        client.post("/hx/vendors/assign", data={"ticket_id": "M-1247", "vendor_id": "V-PLB-11"})
+        delta = sync(client, version, epoch).json()
+        assert "full" not in delta
+        assert [row[0] for row in delta["t"]] == ["M-1247"]
+
+
+def test_version_from_another_epoch_forces_a_full_sync() -> None:
+    config = AppConfig(serve_static=False)
+    with TestClient(create_app(config)) as client:
+        first = sync(client)
+        version, epoch = int(first.headers["X-Store-Version"]), first.headers["X-Store-Epoch"]
+
+    # A restarted app counts versions from scratch and reaches the same number.
+    with TestClient(create_app(config)) as client:
+        response = sync(client, version, epoch)
+        assert response.headers["X-Store-Version"] == str(version)
+        assert response.headers["X-Store-Epoch"] != epoch
+        assert response.status_code == 200
+        assert response.json()["full"] == 1
+
+
+def test_client_behind_the_activity_window_gets_a_full_sync() -> None:
+    source = MockStore()
+    source.seed()
+    feed = ChangeFeed.from_store(source)
+    feed.activity_retention = 3
+    feed.on_store_event("reset", None, source)
+    version = feed.version
+    source.record_activity(ActivityItem("Recent action", "09:00"))
+    assert "full" not in feed.delta(version, feed.epoch)
+
+    for minute in range(3):
+        source.record_activity(ActivityItem(f"Later action {minute}", f"09:0{minute + 1}"))
+
+    assert feed.delta(version, feed.epoch)["full"] == 1
+    assert "full" not in feed.delta(feed.version - 1, feed.epoch)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from app.services.mock_store import MockStore, Vendor
+from app.services.vendor_ranking import AREA_COORDINATES, VendorRanking, score_vendor
+
+SPECIALTIES = ["HVAC", "Plumbing", "Electrical", "General"]
+
+
+def test_shortlist_uses_the_stored_ticket_category() -> None:
+    store = MockStore()
+    store.seed()
+    ranking = VendorRanking.from_store(store)
+    ticket = store.tickets["M-1247"]
+    # The title now reads as plumbing, but the ticket was filed as HVAC.
+    ticket.title = "Water dripping from the ceiling unit"
+
+    specialties = {ranked.vendor.specialty for ranked in ranking.shortlist_for_ticket(ticket)}
+    assert specialties <= {"HVAC", "General"}
+    assert "HVAC" in specialties
+
+    ticket.category = ""
+    assert "Plumbing" in {ranked.vendor.specialty for ranked in ranking.shortlist_for_ticket(ticket)}
+
+
+def random_vendor(rng: random.Random, vendor_id: str) -> Vendor:
+    area = rng.choice(list(AREA_COORDINATES))
+    lat, lon = AREA_COORDINATES[area]
+    return Vendor(
+        vendor_id=vendor_id,
+        name=f"Vendor {vendor_id}",
+        specialty=rng.choice(SPECIALTIES),
+        area=area,
+        availability=rng.choice(["available", "busy"]),
+        response_minutes=rng.randint(15, 180),
+        rating=round(rng.uniform(3.0, 5.0), 1),
+        jobs_completed=rng.randint(0, 800),
+        latitude=lat + rng.uniform(-0.02, 0.02),
+        longitude=lon + rng.uniform(-0.02, 0.02),
+        license_days_left=rng.randint(-10, 365),
+        insurance_valid=rng.random() > 0.2,
+        emirates_id_verified=rng.random() > 0.1,
+        trade_license_verified=True,
+    )
+
+
+def full_sort(ranking: VendorRanking, specialty: str, area: str) -> list[float]:
+    scores = [
+        score
+        for vendor in ranking.vendors.values()
+        if (score := score_vendor(vendor, specialty, area, ranking.open_jobs[vendor.name])) is not None
+    ]
+    return sorted(scores, reverse=True)[: ranking.k]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_incremental_shortlists_match_a_full_sort(seed: int) -> None:
+    rng = random.Random(seed)
+    store = MockStore()
+    store.seed()
+    for i in range(300):
+        store.vendors[f"V-{i}"] = random_vendor(rng, f"V-{i}")
+    store.notify_reset()
+    ranking = VendorRanking.from_store(store)
+    keys = [(specialty, area) for specialty in SPECIALTIES for area in AREA_COORDINATES]
+    vendor_ids, ticket_ids = list(store.vendors), list(store.tickets)
+
+    for step in range(1_500):
+        roll = rng.random()
+        if roll < 0.4:
+            vendor = store.vendors[rng.choice(vendor_ids)]
+            vendor.insurance_valid = not vendor.insurance_valid
+            vendor.license_days_left = rng.randint(-10, 365)
+            ranking.on_store_event("vendor", vendor.vendor_id, vendor)
+        elif roll < 0.6:
+            vendor = random_vendor(rng, rng.choice(vendor_ids))
+            store.vendors[vendor.vendor_id] = vendor
+            ranking.on_store_event("vendor", vendor.vendor_id, vendor)
+        elif roll < 0.8:
+            store.assign_vendor(rng.choice(ticket_ids), rng.choice(vendor_ids))
+        else:
+            store.advance_ticket(rng.choice(ticket_ids))
+        if step % 7 == 0:
+            ranking.shortlist(*rng.choice(keys))
+
+    for specialty, area in keys:
+        shortlist = ranking.shortlist(specialty, area)
+        assert [ranked.score for ranked in shortlist] == full_sort(ranking, specialty, area)
+        for ranked in shortlist:
+            vendor = ranked.vendor
+            assert ranked.score == score_vendor(vendor, specialty, area, ranking.open_jobs[vendor.name])